@@ -0,0 +1,119 @@
+"""
+An autopilot that plays rounds on its own, used as a continuous soak test of the simulation.
+
+Every tick, the autopilot forks the current round into simulated futures and searches them depth-first for a sequence of
+jumps that keeps the bird alive until the end of its planning horizon. The futures are real rounds: the round is copied
+into a scratch session with 'GameSession.snapshot' and 'restore', and stepped with the same bird, pipes and ground that
+the game uses, so the plans exercise (and can never drift from) the actual simulation.
+"""
+from Global import *
+import Session
+import Bird
+import Pipe
+import time
+import math
+
+
+class Autopilot:
+    def __init__(self, resolution: Tuple[int, int] = GAME_RESOLUTION, tick_length: float = 1 / TICK_RATE,
+                 budget: float = 0.002, segment_ticks: int = 2, horizon: float = 0.8, precompute: int = 0):
+        """Futures branch every 'segment_ticks' ticks of 'tick_length' seconds and are searched up to 'horizon' seconds
+        ahead. The search stops when 'budget' seconds of the current frame have been spent, in which case the decision
+        falls back to the preferred one from 'should_jump'. 'precompute' is the setting of the session of its own that
+        the snapshots of the played sessions are restored into (see 'Session.GameSession')."""
+        self.resolution = resolution
+        self.tick_length = tick_length
+        self.budget = budget
+        self.segment_ticks = segment_ticks
+        self.max_depth = max(1, math.ceil(horizon / (tick_length * segment_ticks)))
+        self.scratch = Session.GameSession(resolution, 0, precompute=precompute)  # The futures are simulated in this.
+        # region Geometry
+        self.bird_height = load_image("./Images/Sprites/flap down.png").get_height()
+        self.floor_y = resolution[1] - load_image("./Images/Sprites/ground.png").get_height()
+        self.pipe_width = load_image("./Images/Sprites/pipe.png").get_width()
+        self.target_y = 0
+        # endregion
+        # region Statistics
+        self.deadline = 0
+        self.nodes = 0  # The number of futures expanded since the counter was last read.
+        self.timed_out = False
+        # Futures that are known to crash, keyed by their depth and their rounded position and speed. Futures that only
+        # differ by less than a pixel are assumed to end the same way.
+        self.dead_ends: Set[Tuple[int, int, int]] = set()
+        # endregion
+
+    def start_frame(self) -> None:
+        """Starts the time budget of a new frame. Every decision made until the next call shares the same budget."""
+        self.deadline = time.perf_counter() + self.budget
+
+    def decide(self, session: Session.GameSession) -> bool:
+        """Returns True if the bird should jump on the next tick of the session."""
+        state = session.state_data()
+        if state == "waiting":
+            return True  # Start the round.
+        if state != "started":
+            return False
+        bird = session.get_bird()
+        # The bird rises by about half its jump height after jumping, so jumping below the middle of the gap keeps it
+        # centered.
+        jump_height = Bird.Bird.jump_speed ** 2 / (2 * Bird.Bird.gravity_accel)
+        gap_middle = self.floor_y / 2
+        for x, gap_bottom in session.pipe_group.iter_pipe_pos():
+            if x + self.pipe_width > Bird.Bird.start_x:  # Aim for the next gap as soon as the bird is out of a pipe.
+                gap_middle = gap_bottom - Pipe.Pipe.gap_distance / 2
+                break
+        self.target_y = gap_middle + jump_height / 2
+        self.timed_out = False
+        self.dead_ends.clear()
+        root = session.snapshot()
+        jump_first = self.should_jump(bird.real_y, bird.current_speed)
+        for jump in (jump_first, not jump_first):
+            self.scratch.restore(root)
+            if self.simulate(jump, 1) and self.search(1):
+                return jump
+            if self.timed_out:
+                break
+        return jump_first  # Either no future survives or the budget ran out.
+
+    def should_jump(self, y: float, speed: float) -> bool:
+        """The preferred decision, which is tried first: jump whenever the bird is below the target height and has lost
+        half of the speed of its last jump. This climbs almost as fast as possible when the next gap is far above."""
+        return speed > Bird.Bird.jump_speed / 2 and y + self.bird_height / 2 > self.target_y
+
+    def search(self, depth: int) -> bool:
+        """Returns True if there is a sequence of decisions that keeps the bird alive from the future in the scratch
+        session until the end of the horizon."""
+        self.nodes += 1
+        if depth >= self.max_depth:
+            return True
+        bird = self.scratch.get_bird()
+        key = (depth, round(bird.real_y), round(bird.current_speed))
+        if key in self.dead_ends:
+            return False
+        if time.perf_counter() > self.deadline:
+            self.timed_out = True
+            return False
+        node = self.scratch.snapshot()
+        jump_first = self.should_jump(bird.real_y, bird.current_speed)
+        for jump in (jump_first, not jump_first):
+            self.scratch.restore(node)
+            if self.simulate(jump, self.segment_ticks) and self.search(depth + 1):
+                return True
+            if self.timed_out:
+                return False
+        self.dead_ends.add(key)
+        return False
+
+    def simulate(self, jump: bool, ticks: int) -> bool:
+        """Steps the scratch session for a number of ticks, jumping on the first one if 'jump' is True. Returns False if
+        the bird crashed."""
+        for tick in range(ticks):
+            if self.scratch.step(self.tick_length, jump and tick == 0) != "started":
+                return False
+        return True
+
+    def pop_node_count(self) -> int:
+        """Returns the number of futures expanded since the last call."""
+        count = self.nodes
+        self.nodes = 0
+        return count
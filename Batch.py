@@ -0,0 +1,143 @@
+"""
+Simulates a whole population of birds flying through the same pipe course at once, for neuroevolution and parameter
+sweeps. The state of every bird is stored in NumPy arrays and all birds are stepped together, so thousands of birds can be
+simulated much faster than real time on a single core.
+
+Birds are reduced to the bounding box of their costume's mask and do not rotate, so the results are close to, but not
+exactly the same as, a round played with 'Bird.Bird'. Apart from Pygame, this file also requires the 'NumPy' module.
+"""
+from collections import deque
+from Global import *
+import Bird
+import Pipe
+import Ground
+import numpy
+import pygame
+
+
+class BatchBirdSim:
+    def __init__(self, count: int, resolution: Tuple[int, int] = GAME_RESOLUTION, seed: Optional[int] = None):
+        self.count = count
+        self.resolution = resolution
+        # region Geometry
+        hit_box = pygame.Rect(0, 0, 0, 0)
+        for file in ("flap down.png", "flap middle.png", "flap up.png"):
+            for rect in pygame.mask.from_surface(load_image("./Images/Sprites/{}".format(file))).get_bounding_rects():
+                hit_box = rect if hit_box.size == (0, 0) else hit_box.union(rect)
+        self.hit_box = hit_box  # Relative to the bird's position.
+        self.pipe_width = load_image("./Images/Sprites/pipe.png").get_width()
+        ground_size = load_image("./Images/Sprites/ground.png").get_size()
+        self.floor_y = self.resolution[1] - ground_size[1]
+        self.gap_range = Pipe.Course.calc_gap_range(self.resolution, ground_size)
+        self.bird_x = Bird.Bird.start_x
+        self.bird_left = self.bird_x + self.hit_box.left
+        self.bird_right = self.bird_x + self.hit_box.right
+        self.bird_mid = self.bird_x + self.hit_box.centerx
+        self.start_y = (self.floor_y - self.hit_box.height) / 2 - self.hit_box.top
+        # endregion
+        # region Physics Constants
+        self.terminal_velocity = Bird.Bird.terminal_velocity
+        self.jump_speed = Bird.Bird.jump_speed
+        self.gravity_accel = Bird.Bird.gravity_accel
+        self.delta_x = Ground.GroundGroup.delta_x
+        self.gap_distance = Pipe.Pipe.gap_distance
+        self.pipe_distance = Pipe.PipeGroup.pipe_distance
+        # endregion
+        # region Bird State
+        self.y = numpy.empty(count, dtype=numpy.float64)
+        self.speed = numpy.empty(count, dtype=numpy.float64)
+        self.alive = numpy.empty(count, dtype=numpy.bool_)
+        self.score = numpy.empty(count, dtype=numpy.int64)
+        # Scratch buffers that are reused every step to avoid allocating new arrays.
+        self.float_buffer = numpy.empty(count, dtype=numpy.float64)
+        self.hit = numpy.empty(count, dtype=numpy.bool_)
+        self.bool_buffer = numpy.empty(count, dtype=numpy.bool_)
+        # endregion
+        # region Course State
+        self.course: Optional[Pipe.Course] = None
+        # Pipes are spawned on the right and despawned on the left, from both ends of these queues.
+        self.pipe_x: Deque[float] = deque()
+        self.pipe_gap: Deque[int] = deque()  # The y position of the top of each bottom pipe.
+        self.next_pipe = 0  # Index of the first pipe that hasn't been passed yet.
+        # endregion
+        self.time = 0
+        self.step_count = 0
+        self.reset(seed)
+
+    def reset(self, seed: Optional[int] = None) -> None:
+        self.y.fill(self.start_y)
+        self.speed.fill(0)
+        self.alive.fill(True)
+        self.score.fill(0)
+        # The same course as a 'Session.GameSession' with the same seed.
+        self.course = Pipe.Course(self.gap_range, seed)
+        self.pipe_x.clear()
+        self.pipe_gap.clear()
+        self.spawn_pipe(self.resolution[0])
+        self.next_pipe = 0
+        self.time = 0
+        self.step_count = 0
+
+    def spawn_pipe(self, x: float) -> None:
+        self.pipe_x.append(x)
+        self.pipe_gap.append(next(self.course))
+
+    def step(self, delta_time: float, jump: Optional[numpy.ndarray] = None) -> int:
+        """Advances every bird by 'delta_time' seconds. 'jump' is an optional boolean array that selects the birds that
+        jump before the step. Returns the number of birds that are still alive."""
+        y, speed, alive, hit, bool_buffer, float_buffer = (self.y, self.speed, self.alive, self.hit, self.bool_buffer,
+                                                           self.float_buffer)
+        if jump is not None:
+            numpy.logical_and(jump, alive, out=bool_buffer)
+            numpy.putmask(speed, bool_buffer, self.jump_speed)
+        # region Bird Movement
+        numpy.multiply(alive, self.gravity_accel * delta_time, out=float_buffer)  # Dead birds don't fall.
+        speed += float_buffer
+        numpy.minimum(speed, self.terminal_velocity, out=speed)
+        numpy.multiply(speed, delta_time, out=float_buffer)
+        y += float_buffer
+        numpy.maximum(y, -self.hit_box.top, out=y)  # The ceiling stops the bird without killing it.
+        # endregion
+        # region Pipe Movement
+        movement = self.delta_x * delta_time
+        for i in range(len(self.pipe_x)):
+            self.pipe_x[i] += movement
+        if self.pipe_x[0] < -self.pipe_width:
+            self.pipe_x.popleft()
+            self.pipe_gap.popleft()
+            self.next_pipe -= 1
+        if self.pipe_x[-1] < self.resolution[0] - self.pipe_width - self.pipe_distance:
+            self.spawn_pipe(self.pipe_x[-1] + self.pipe_width + self.pipe_distance)
+        # endregion
+        # region Collision
+        numpy.add(y, self.hit_box.bottom, out=float_buffer)
+        numpy.greater(float_buffer, self.floor_y, out=hit)
+        for x, gap in zip(self.pipe_x, self.pipe_gap):
+            if x >= self.bird_right:
+                break  # Pipes are sorted from left to right.
+            if x + self.pipe_width <= self.bird_left:
+                continue
+            numpy.greater(float_buffer, gap, out=bool_buffer)
+            hit |= bool_buffer
+            numpy.add(y, self.hit_box.top, out=float_buffer)
+            numpy.less(float_buffer, gap - self.gap_distance, out=bool_buffer)
+            hit |= bool_buffer
+            numpy.add(y, self.hit_box.bottom, out=float_buffer)
+        hit &= alive
+        numpy.putmask(speed, hit, 0)
+        numpy.logical_xor(alive, hit, out=alive)
+        # endregion
+        if self.next_pipe < len(self.pipe_x) and self.pipe_x[self.next_pipe] + self.pipe_width / 2 <= self.bird_mid:
+            self.next_pipe += 1
+            numpy.add(self.score, alive, out=self.score, casting="unsafe")
+        self.time += delta_time
+        self.step_count += 1
+        return int(numpy.count_nonzero(alive))
+
+    def get_next_pipe(self) -> Tuple[float, int, int]:
+        """Returns the x position, gap top and gap bottom of the first pipe the birds haven't passed yet."""
+        gap = self.pipe_gap[self.next_pipe]
+        return self.pipe_x[self.next_pipe], gap - self.gap_distance, gap
+
+    def get_alive_count(self) -> int:
+        return int(numpy.count_nonzero(self.alive))
@@ -1,41 +1,66 @@
 from Global import *
 import Physics
+import Ground
 import Time
+import Pipe
 import math
 import pygame
 if TYPE_CHECKING:
-    import Ground
     import Mouse
-    import Pipe
 
 
 class Bird(pygame.sprite.Sprite):
-    def __init__(self, resolution: Tuple[int, int], ground_size: Tuple[int, int]):
+    # region Physics Constants
+    start_x = 70
+    start_y = 200
+    terminal_velocity = 700
+    jump_speed = -360
+    gravity_accel = 950
+    # endregion
+    # Real y, speed, angle, costume index, costume direction, wiggling, then the costume, physics and wiggle timers.
+    state_format = "dddBb?" + Time.Time.state_format * 3
+    # The costumes and their masks, decoded once and shared by every bird (see 'load_costumes').
+    costumes: Tuple[pygame.Surface, ...] = ()
+    costume_masks: Tuple[pygame.mask.Mask, ...] = ()
+    angle_step = 1  # Rotated costumes are cached for angles rounded to multiples of this, in degrees.
+    min_angle = -90
+    max_angle = 45
+    # The cropped rotated costume, its mask and the offsets that center it, keyed by the costume index and the rounded
+    # angle divided by 'angle_step'. Shared by every bird and filled in as angles are reached, or all at once by
+    # 'get_images'.
+    rotation_cache: Dict[Tuple[int, int], Tuple[pygame.Surface, pygame.mask.Mask, int, int]] = {}
+    # The masks of the cached rotations drawn as surfaces for the debug view, with the same keys. A costume index on its
+    # own is the key of an unrotated costume.
+    debug_masks: Dict[Union[int, Tuple[int, int]], pygame.Surface] = {}
+    # The solid rows of every column and the solid columns of every row of the masks, as bits of integers, with the keys
+    # of 'debug_masks'. Collision queries read these instead of creating masks.
+    mask_bits: Dict[Union[int, Tuple[int, int]], Tuple[Tuple[int, ...], Tuple[int, ...]]] = {}
+
+    def __init__(self, resolution: Tuple[int, int], ground_size: Tuple[int, int],
+                 clock: Optional[Time.BaseClock] = None):
         super().__init__()
+        self.clock = clock
         # region Costume Data
-        self.costumes = tuple(pygame.image.load(find_abs_path("./Images/Sprites/{}".format(file)))
-                              .convert_alpha() for file in ("flap down.png", "flap middle.png", "flap up.png"))
+        self.load_costumes()
         self.image = self.costumes[0]
         self.costume_index = 0
         self.costume_dir = 1
         self.costume_switch_delay = 0.2
-        self.costume_timer = Time.Time()
+        self.costume_timer = Time.Time(clock)
         self.costume_timer.reset_timer()
         # endregion
         # region Physics Variables
-        self.x = 70
-        self.y = 200
-        self.wiggle = Physics.Wiggle()
+        self.x = self.start_x
+        self.y = self.start_y
+        self.wiggle = Physics.Wiggle(clock)
         self.vertical_span = round((resolution[1] - ground_size[1]) / 2 - self.wiggle.max_vertical_movement() / 2)
-        self.physics_timer = Time.Time()
-        self.terminal_velocity = 700
-        self.jump_speed = -360
-        self.gravity_accel = 950
+        self.physics_timer = Time.Time(clock)
         self.current_speed = 0
         # endregion
         self.rect = pygame.Rect(self.x, self.y, *self.image.get_size())
-        self.mask = pygame.mask.from_surface(self.image)
+        self.mask = self.costume_masks[0]
         # region Rotation Variables
+        self.rotation_key: Union[int, Tuple[int, int]] = 0  # The key of the current image in 'debug_masks'.
         self.angle = 0
         self.constant_x = self.x
         self.real_y = self.y  # The y position without the rotation offset.
@@ -44,6 +69,33 @@ class Bird(pygame.sprite.Sprite):
         self.starting_rect = self.rect.copy()
         # endregion
 
+    @classmethod
+    def load_costumes(cls) -> None:
+        """Decodes the shared costumes and their masks, unless they have been already."""
+        if not cls.costumes:
+            cls.costumes = tuple(load_image("./Images/Sprites/{}".format(file))
+                                 for file in ("flap down.png", "flap middle.png", "flap up.png"))
+            cls.costume_masks = tuple(pygame.mask.from_surface(costume) for costume in cls.costumes)
+
+    @classmethod
+    def get_images(cls) -> List[pygame.Surface]:
+        """Returns every image that birds are drawn with, rotating the costumes to the angles that aren't cached yet. The
+        'mask_bits' of every image are built along with them, so collision queries never have to build any during a
+        round."""
+        cls.load_costumes()
+        images = list(cls.costumes)
+        for costume_index, mask in enumerate(cls.costume_masks):
+            if costume_index not in cls.mask_bits:
+                cls.mask_bits[costume_index] = cls.calc_mask_bits(mask)
+        for costume_index in range(len(cls.costumes)):
+            for angle_index in range(round(cls.min_angle / cls.angle_step), round(cls.max_angle / cls.angle_step) + 1):
+                key = (costume_index, angle_index)
+                image, mask = cls.get_rotation(key)[:2]
+                if key not in cls.mask_bits:
+                    cls.mask_bits[key] = cls.calc_mask_bits(mask)
+                images.append(image)
+        return images
+
     def update_y_pos(self, value: Union[int, float]) -> None:
         """
         Change both the y position with rotation offset (which is needed for collision detection) and the y position
@@ -68,34 +120,64 @@ class Bird(pygame.sprite.Sprite):
 
     def move(self, amount: Union[int, float], pipe_group: Optional["Pipe.PipeGroup"],
              ground_pos: Optional[Tuple[Union[int, float],
-                                        Union[int, float]]]) -> Tuple[Literal[0, 1, 2], Optional[pygame.sprite.Sprite]]:
+                                        Union[int, float]]]) -> Tuple[Literal[0, 1, 2], Optional["Pipe.Pipe"]]:
         if pipe_group is None:
             self.update_y_pos(amount)
             return 0, None
-        shift_count, remainder = divmod(abs(amount), self.rect.height)
-        shift_count = math.floor(shift_count)  # To remove the trailing ".0"
-        shift_amount = math.copysign(self.rect.height, amount)
-        remainder = math.copysign(remainder, amount)
-        for i in range(shift_count + 1):
-            temp_amount = remainder if i == shift_count else shift_amount
-            if temp_amount == 0:
+        # Find the pipe rectangle that the bird would touch first along the movement, and where it would touch it.
+        hit_pipe = None
+        pipe_distance = contact = 0
+        y = math.floor(self.y)
+        for pipe, _, (left, top, right, bottom) in pipe_group.iter_hit_rects(self.rect.x, self.rect.right):
+            extent = self.column_extent(left - self.rect.x, right - self.rect.x)
+            if extent is None:
                 continue
-            self.update_y_pos(temp_amount)
+            if amount > 0 and y + extent[0] < bottom:
+                rect_contact = top - extent[1]
+                distance = rect_contact + 1 - self.y  # The bird overlaps the rectangle from this distance on.
+                if distance > amount:
+                    continue
+            elif amount < 0 and y + extent[1] > top:
+                rect_contact = bottom - extent[0]
+                distance = self.y - rect_contact
+                if distance >= -amount:
+                    continue
+            else:
+                continue
+            if hit_pipe is None or distance < pipe_distance:
+                hit_pipe, pipe_distance, contact = pipe, distance, rect_contact
+        # Pipes win ties with the ground, since they were checked first when the movement was stepped.
+        if hit_pipe is not None and (amount < 0 or pipe_distance <= ground_pos[1] - self.rect.height - self.y):
+            # Stop on the last whole pixel before the pipe, keeping the fraction of the starting position.
+            self.update_y_pos(contact - math.floor(self.y))
             self.rect = pygame.Rect(self.x, self.y, self.rect.width, self.rect.height)
-            result = pygame.sprite.spritecollideany(self, pipe_group, collided=collide_function)
-            if result is not None:  # Resolve collision
-                opposite_amount = -math.copysign(1, temp_amount)  # 1 pixel in opposite direction
-                collided = 0
-                while collided is not None:
-                    self.update_y_pos(opposite_amount)
-                    self.rect = pygame.Rect(self.x, self.y, self.rect.width, self.rect.height)
-                    collided = pygame.sprite.spritecollideany(self, pipe_group, collided=collide_function)
-                return 1, result
-            result = self.y_bounds_collision(ground_pos)
-            if result == 1:
-                return 2, None
+            return 1, hit_pipe
+        self.update_y_pos(amount)
+        self.rect = pygame.Rect(self.x, self.y, self.rect.width, self.rect.height)
+        if self.y_bounds_collision(ground_pos) == 1:
+            return 2, None
         return 0, None
 
+    def get_trajectory(self, tick_length: float = 0) -> Physics.Trajectory:
+        """Returns the predicted motion of the bird's y position (without the rotation offset) if it doesn't jump. See
+        'Physics.Trajectory' for 'tick_length'."""
+        return Physics.Trajectory(self.real_y, self.current_speed, self.gravity_accel, self.terminal_velocity,
+                                  tick_length)
+
+    def time_to_pipe_impact(self, pipe_group: "Pipe.PipeGroup", tick_length: float = 0) -> Optional[float]:
+        """Returns the time until the bird would hit the next pipe that it isn't past yet if it doesn't jump, or None if
+        it would fly through the gap. The bird is treated as its unrotated costume, and the pipes are assumed to keep
+        moving at the speed of the ground."""
+        scroll_speed = -Ground.GroundGroup.delta_x
+        width, height = self.starting_rect.size
+        for x, gap_bottom in pipe_group.iter_pipe_pos():
+            if x + pipe_group.width > self.constant_x:
+                enter_time = max((x - self.constant_x - width) / scroll_speed, 0)
+                exit_time = (x + pipe_group.width - self.constant_x) / scroll_speed
+                return self.get_trajectory(tick_length).time_to_impact(gap_bottom - Pipe.Pipe.gap_distance,
+                                                                       gap_bottom - height, enter_time, exit_time)
+        return None
+
     def jump(self) -> None:
         if self.wiggle is not None:
             self.physics_timer.reset_timer()
@@ -103,36 +185,46 @@ class Bird(pygame.sprite.Sprite):
         self.current_speed = self.jump_speed
 
     def calc_angle(self, speed: Union[int, float],
-                   pipe_group: Optional["Pipe.PipeGroup"]) -> Optional[pygame.sprite.Sprite]:
+                   pipe_group: Optional["Pipe.PipeGroup"]) -> Optional["Pipe.Pipe"]:
         if speed <= 0:
             # Speed: 0 ~ self.jump_speed
             # Angle: 0 ~ 45
-            angle = 45 * (self.current_speed / self.jump_speed)
+            angle = self.max_angle * (self.current_speed / self.jump_speed)
         else:
             # Speed Range: 1 ~ self.terminal_velocity
             # angle: -(1 ~ 90)
-            angle = -90 * (self.current_speed / self.terminal_velocity)
+            angle = self.min_angle * (self.current_speed / self.terminal_velocity)
         self.set_angle(angle)
         if pipe_group is not None:
-            return pygame.sprite.spritecollideany(self, pipe_group, collided=collide_function)
+            return pipe_group.collide_bird(self)
 
     def set_angle(self, new_angle: float) -> None:
-        self.image = self.costumes[self.costume_index]  # Reset surface to un-rotated image
         self.angle = new_angle
-        self.image = pygame.transform.rotate(self.image, self.angle)  # Rotate surface
-        new_size = self.image.get_bounding_rect()
-        cropped_surface = pygame.Surface((new_size.width, new_size.height))
-        cropped_surface.fill(TRANSPARENT)
-        cropped_surface.set_colorkey(TRANSPARENT)
-        cropped_surface.blit(self.image, (0, 0), area=new_size)
-        self.image = cropped_surface  # Crop the unnecessary extra space added by the rotation
-        # Calculate the offset needed to center the image after the rotation
-        self.offset_x = round((self.starting_rect.width - new_size.width) / 2)
-        self.offset_y = round((self.starting_rect.height - new_size.height) / 2)
+        self.rotation_key = (self.costume_index, round(new_angle / self.angle_step))
+        self.image, self.mask, self.offset_x, self.offset_y = self.get_rotation(self.rotation_key)
         self.x = self.constant_x + self.offset_x
         self.y = self.real_y + self.offset_y
-        self.rect = pygame.Rect(self.x, self.y, new_size.width, new_size.height)
-        self.mask = pygame.mask.from_surface(self.image)
+        self.rect = pygame.Rect(self.x, self.y, *self.image.get_size())
+
+    @classmethod
+    def get_rotation(cls, key: Tuple[int, int]) -> Tuple[pygame.Surface, pygame.mask.Mask, int, int]:
+        """Returns the entry of 'rotation_cache' for a key, rotating and cropping the costume if it isn't cached yet."""
+        rotation = cls.rotation_cache.get(key)
+        if rotation is None:
+            costume_index, angle_index = key
+            costume = cls.costumes[costume_index]
+            rotated_image = pygame.transform.rotate(costume, angle_index * cls.angle_step)
+            new_size = rotated_image.get_bounding_rect()
+            cropped_surface = pygame.Surface((new_size.width, new_size.height))
+            cropped_surface.fill(TRANSPARENT)
+            cropped_surface.set_colorkey(TRANSPARENT)
+            cropped_surface.blit(rotated_image, (0, 0), area=new_size)  # Crop the extra space added by the rotation
+            # Calculate the offset needed to center the image after the rotation
+            rotation = (cropped_surface, pygame.mask.from_surface(cropped_surface),
+                        round((costume.get_width() - new_size.width) / 2),
+                        round((costume.get_height() - new_size.height) / 2))
+            cls.rotation_cache[key] = rotation
+        return rotation
 
     def increment_costume_num(self) -> None:
         self.costume_index += self.costume_dir
@@ -153,7 +245,8 @@ class Bird(pygame.sprite.Sprite):
             # pass "False" to the force_update parameter to omit performing the redundant image update.
             if force_update:
                 self.image = self.costumes[self.costume_index]
-                self.mask = pygame.mask.from_surface(self.image)
+                self.mask = self.costume_masks[self.costume_index]
+                self.rotation_key = self.costume_index
 
     def pause(self) -> None:
         self.costume_timer.pause()
@@ -198,40 +291,135 @@ class Bird(pygame.sprite.Sprite):
     def get_mask(self) -> pygame.mask.Mask:
         return self.mask
 
+    def get_debug_mask(self) -> pygame.Surface:
+        """Returns the mask drawn in white on black, which is cached along with the image."""
+        surface = self.debug_masks.get(self.rotation_key)
+        if surface is None:
+            surface = self.mask.to_surface(setcolor=WHITE, unsetcolor=BLACK)
+            self.debug_masks[self.rotation_key] = surface
+        return surface
+
+    def get_mask_bits(self) -> Tuple[Tuple[int, ...], Tuple[int, ...]]:
+        """Returns the entry of 'mask_bits' for the current mask, building it if it isn't cached yet."""
+        bits = self.mask_bits.get(self.rotation_key)
+        if bits is None:
+            bits = self.calc_mask_bits(self.mask)
+            self.mask_bits[self.rotation_key] = bits
+        return bits
+
+    @staticmethod
+    def calc_mask_bits(mask: pygame.mask.Mask) -> Tuple[Tuple[int, ...], Tuple[int, ...]]:
+        """Returns the solid rows of every column and the solid columns of every row of a mask, as bits of integers. The
+        mask is read as a string of ones and zeros, which every row and column is sliced out of in a single pass."""
+        width, height = mask.get_size()
+        # The red channel of the mask drawn in white on black.
+        pixels = pygame.image.tobytes(mask.to_surface(setcolor=WHITE, unsetcolor=BLACK), "RGB")[::3]
+        pixels = pixels.translate(bytes.maketrans(b"\x00\xff", b"01"))
+        # The first pixel is the lowest bit, so the slices are reversed before they are parsed.
+        columns = tuple(int(pixels[x::width][::-1], 2) for x in range(width))
+        rows = tuple(int(pixels[y * width:(y + 1) * width][::-1], 2) for y in range(height))
+        return columns, rows
+
+    @staticmethod
+    def calc_bit_extent(lines: Tuple[int, ...], start: int, end: int) -> Optional[Tuple[int, int]]:
+        """Returns the first and after-last bits that are set in any of the lines from 'start' to 'end' (exclusive), or
+        None if there are none."""
+        bits = 0
+        for line in lines[max(start, 0):max(end, 0)]:
+            bits |= line
+        if not bits:
+            return None
+        return (bits & -bits).bit_length() - 1, bits.bit_length()
+
+    def column_extent(self, left: int, right: int) -> Optional[Tuple[int, int]]:
+        """Returns the first row of the mask that has solid pixels between the columns 'left' and 'right' (exclusive),
+        and the row after the last one. None is returned if there are no solid pixels in those columns."""
+        return self.calc_bit_extent(self.get_mask_bits()[0], left, right)
+
+    def overlaps_rect(self, rect: Tuple[int, int, int, int]) -> bool:
+        """Returns True if any solid pixel of the mask is inside a (left, top, right, bottom) rectangle in screen
+        coordinates."""
+        left, top, right, bottom = rect
+        top, bottom = max(top - self.rect.y, 0), bottom - self.rect.y
+        if top >= bottom:
+            return False
+        rows = (1 << bottom) - (1 << top)
+        for column in self.get_mask_bits()[0][max(left - self.rect.x, 0):max(right - self.rect.x, 0)]:
+            if column & rows:
+                return True
+        return False
+
+    def row_extent(self, top: int, bottom: int) -> Optional[Tuple[int, int]]:
+        """Like 'column_extent', but returns the first and after-last columns of the solid pixels between two rows."""
+        return self.calc_bit_extent(self.get_mask_bits()[1], top, bottom)
+
+    def get_state(self) -> tuple:
+        wiggle_state = (0, 0, False) if self.wiggle is None else self.wiggle.get_state()
+        return (self.real_y, self.current_speed, self.angle, self.costume_index, self.costume_dir,
+                self.wiggle is not None, *self.costume_timer.get_state(), *self.physics_timer.get_state(),
+                *wiggle_state)
+
+    def set_state(self, *state: Union[int, float, bool]) -> None:
+        """Restores a state returned by 'get_state'. The image, rect and mask are rebuilt from the restored costume and
+        angle."""
+        self.real_y, self.current_speed, angle, self.costume_index, self.costume_dir, wiggling = state[:6]
+        self.costume_timer.set_state(*state[6:9])
+        self.physics_timer.set_state(*state[9:12])
+        if wiggling:
+            if self.wiggle is None:
+                self.wiggle = Physics.Wiggle(self.clock)
+            self.wiggle.set_state(*state[12:15])
+            self.angle = angle
+            self.image = self.costumes[self.costume_index]
+            self.x = self.constant_x
+            self.y = self.real_y
+            self.rect = pygame.Rect(self.x, self.y, *self.image.get_size())
+            self.mask = self.costume_masks[self.costume_index]
+            self.rotation_key = self.costume_index
+        else:
+            self.wiggle = None
+            self.set_angle(angle)
+
 
 class BirdManager(pygame.sprite.Group):
-    def __init__(self, resolution: Tuple[int, int], z_index: int):
+    def __init__(self, resolution: Tuple[int, int], z_index: int, clock: Optional[Time.BaseClock] = None):
         super().__init__()
         self.resolution = resolution
+        self.clock = clock
         self.spawned = False
         self.bird_object: Optional[Bird] = None
         self.clicked = False
         self.z_index = z_index
 
     def process_user_events(self, state_data: Callable[..., Optional[str]], pipe_group: "Pipe.PipeGroup",
-                            mouse_object: "Mouse.Cursor", mouse_initiated: bool) -> None:
+                            mouse_object: Optional["Mouse.Cursor"], mouse_initiated: bool) -> bool:
+        """Returns True if the bird jumped."""
+        jumped = False
         if mouse_initiated:
             conditions = (not self.z_index == mouse_object.get_z_index(), not mouse_object.get_button_state(1))
             if any(conditions):
                 if conditions[1]:
                     self.clicked = False
-                return None
+                return False
         if not mouse_initiated or (mouse_initiated and not self.clicked):
             self.clicked = True if mouse_initiated else self.clicked  # Don't change value if 'self.clicked' is False.
             if state_data() == "waiting":
                 state_data("started")
                 pipe_group.generate()
                 self.bird_object.jump()
+                jumped = True
             elif state_data() == "started":
                 self.bird_object.jump()
+                jumped = True
         if mouse_initiated:
             mouse_object.increment_z_index()  # It's not possible to fail to interact with the bird :)
+        return jumped
 
     def spawn_bird(self, state_data: Callable[..., Optional[str]],
                    ground_group: "Ground.GroundGroup") -> None:
         if state_data() == "menu":
             self.spawned = True
-            self.bird_object = Bird(self.resolution, ground_group.get_size())
+            self.bird_object = Bird(self.resolution, ground_group.get_size(), self.clock)
             self.add(self.bird_object)
             state_data("waiting")
 
@@ -261,7 +449,7 @@ class BirdManager(pygame.sprite.Group):
                 game_over_binding()
 
     def update_all(self, ground_group: "Ground.GroundGroup",
-                   pipe_group: "Pipe.PipeGroup") -> Tuple[Literal[0, 1, 2], Optional[pygame.sprite.Sprite]]:
+                   pipe_group: "Pipe.PipeGroup") -> Tuple[Literal[0, 1, 2], Optional["Pipe.Pipe"]]:
         """Returns a two-item tuple with the first item being the integer 0 if not colliding with anything, 1 if
         colliding with a pipe, and 2 if colliding with the ground. When the first item is the integer 1, the second item
         will contain the pipe instance that the bird is colliding with, else it would be None."""
@@ -278,6 +466,13 @@ class BirdManager(pygame.sprite.Group):
         pipe_group.kill_colliding()
         return 0, None
 
+    def get_state(self) -> Tuple[bool, bool]:
+        return self.spawned, self.clicked
+
+    def set_state(self, spawned: bool, clicked: bool) -> None:
+        self.spawned = spawned
+        self.clicked = clicked
+
     def pause(self) -> None:
         if self.bird_object is not None:
             self.bird_object.pause()
@@ -292,8 +487,32 @@ class BirdManager(pygame.sprite.Group):
         ground_group.reset_pos()
         return amount
 
-    def advanced_draw(self, surface: pygame.Surface, debug: bool) -> None:
+    def advanced_draw(self, surface: pygame.Surface, debug: bool,
+                      pipe_group: Optional["Pipe.PipeGroup"] = None) -> None:
         self.draw(surface)
         if debug:
-            pygame.draw.rect(surface, BLACK, self.bird_object.get_rect(), 1)
-            self.bird_object.get_mask().to_surface(surface, setcolor=WHITE, unsetcolor=BLACK)
+            self.draw_debug(surface, pipe_group)
+
+    def draw_debug(self, surface: pygame.Surface, pipe_group: Optional["Pipe.PipeGroup"] = None) -> None:
+        """Draws the bounding box and mask of the bird, and its predicted path while it's flying."""
+        pygame.draw.rect(surface, BLACK, self.bird_object.get_rect(), 1)
+        surface.blit(self.bird_object.get_debug_mask(), (0, 0))
+        if self.bird_object.wiggle is None:
+            self.draw_trajectory(surface, pipe_group)
+
+    def draw_trajectory(self, surface: pygame.Surface, pipe_group: Optional["Pipe.PipeGroup"],
+                        duration: float = 1) -> None:
+        """Draws the predicted path of the bird's center for the next 'duration' seconds if it doesn't jump, relative to
+        the moving pipes. The point where it would hit the next pipe is marked."""
+        bird = self.bird_object
+        trajectory = bird.get_trajectory()
+        impact_time = None if pipe_group is None else bird.time_to_pipe_impact(pipe_group)
+        scroll_speed = -Ground.GroundGroup.delta_x
+        center_x = bird.constant_x + bird.starting_rect.width / 2
+        half_height = bird.starting_rect.height / 2
+        end_time = duration if impact_time is None else min(impact_time, duration)
+        points = [(center_x + scroll_speed * t, trajectory.get_y(t) + half_height)
+                  for t in (end_time * i / 30 for i in range(31))]
+        pygame.draw.lines(surface, ORANGE, False, points, 2)
+        if impact_time is not None and impact_time <= duration:
+            pygame.draw.circle(surface, RED, points[-1], 5)
@@ -0,0 +1,82 @@
+"""
+Tracks which parts of the screen changed between frames, so that only those parts are drawn and sent to the window.
+
+Every frame, each layer of the screen reports the rectangles it covers along with a signature of its appearance, such as
+the images it draws. A layer is dirty if either of them differs from the previous frame, in which case both its old and
+its new rectangles have to be redrawn. Layers that can't tell whether their content changed are redrawn every frame, and
+layers that aren't reported in a frame are treated as removed. The dirty rectangles are merged into a few regions, and
+the frame is drawn once per region with the surface clipped to it.
+"""
+from Global import *
+import pygame
+
+
+class Compositor:
+    def __init__(self, resolution: Tuple[int, int], max_regions: int = 8, max_coverage: float = 0.6):
+        """Regions are merged into their bounding box if there are more than 'max_regions' of them, and the whole screen
+        is redrawn if they cover more than 'max_coverage' of it."""
+        self.screen_rect = pygame.Rect((0, 0), resolution)
+        self.max_regions = max_regions
+        self.max_coverage = max_coverage
+        # The rectangles and signature of every layer in the previous frame.
+        self.layers: Dict[str, Tuple[List[pygame.Rect], Any]] = {}
+        self.tracked: Set[str] = set()
+        self.dirty_rects: List[pygame.Rect] = []
+        self.full_redraw = True
+
+    def invalidate(self) -> None:
+        """Redraws the whole screen in the next frame, e.g. after the window was resized."""
+        self.full_redraw = True
+
+    def track(self, key: str, rects: List[pygame.Rect], signature: Any = None, changed: bool = False) -> None:
+        """Reports the rectangles that the layer 'key' covers in this frame. 'signature' should change whenever the
+        layer looks different, and 'changed' marks the layer as dirty regardless."""
+        previous = self.layers.get(key)
+        if previous is None or previous[0] != rects or previous[1] != signature:
+            if previous is not None:
+                self.dirty_rects.extend(previous[0])
+            self.dirty_rects.extend(rects)
+        elif changed:
+            self.dirty_rects.extend(rects)
+        self.layers[key] = (rects, signature)
+        self.tracked.add(key)
+
+    def add_dirty_rects(self, rects: Iterable[pygame.Rect]) -> None:
+        self.dirty_rects.extend(rects)
+
+    def end_frame(self) -> List[pygame.Rect]:
+        """Returns the regions of the screen that have to be redrawn in this frame, and starts the next frame."""
+        for key in [key for key in self.layers if key not in self.tracked]:
+            self.dirty_rects.extend(self.layers.pop(key)[0])
+        self.tracked.clear()
+        rects = [rect.clip(self.screen_rect) for rect in self.dirty_rects]
+        self.dirty_rects.clear()
+        if self.full_redraw:
+            self.full_redraw = False
+            return [self.screen_rect.copy()]
+        regions = self.merge_rects([rect for rect in rects if rect.width and rect.height])
+        if len(regions) > self.max_regions:
+            regions = [regions[0].unionall(regions[1:])]
+        if sum(region.width * region.height for region in regions) > \
+                self.max_coverage * self.screen_rect.width * self.screen_rect.height:
+            return [self.screen_rect.copy()]
+        return regions
+
+    @staticmethod
+    def merge_rects(rects: List[pygame.Rect]) -> List[pygame.Rect]:
+        """Merges overlapping rectangles into their bounding boxes until none of them overlap, so no area is drawn
+        twice."""
+        merged: List[pygame.Rect] = []
+        for rect in rects:
+            rect = rect.copy()
+            index = rect.collidelist(merged)
+            while index != -1:
+                rect.union_ip(merged.pop(index))
+                index = rect.collidelist(merged)
+            merged.append(rect)
+        return merged
+
+    @staticmethod
+    def get_blit_rects(blit_sequence: Iterable[tuple]) -> List[pygame.Rect]:
+        """Returns the rectangles that a sequence in the format of 'Surface.blits' draws to."""
+        return [pygame.Rect(blit[1], blit[2].size if len(blit) > 2 else blit[0].get_size()) for blit in blit_sequence]
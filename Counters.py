@@ -51,19 +51,69 @@ class FPS(pygame.sprite.Sprite):
         surface.blit(self.image, (self.x, self.y))
 
 
+class NodeRate(pygame.sprite.Sprite):
+    def __init__(self, resolution: Tuple[int, int], y: int):
+        """Displays the number of futures expanded per second by the autopilot's search, updated once a second. The text
+        is right-aligned at the given y position."""
+        super().__init__()
+        self.resolution = resolution
+        self.font = pygame.font.SysFont("arial", 25)
+        self.timer = Time.Time()
+        self.timer.reset_timer()
+        self.node_count = 0
+        self.x = 0
+        self.y = y
+        self.image = None
+        self.rect = None
+        self.update_text("-- nodes/s")
+
+    def update_text(self, new_text: str) -> None:
+        self.image = self.font.render(new_text, True, BLACK)
+        self.x = self.resolution[0] - self.image.get_size()[0]
+        self.rect = pygame.Rect(self.x, self.y, *self.image.get_size())
+
+    def tick(self, node_count: int) -> None:
+        self.node_count += node_count
+        time = self.timer.get_time()
+        if time >= 1:
+            self.update_text("{} nodes/s".format(round(self.node_count / time)))
+            self.timer.reset_timer()
+            self.node_count = 0
+
+    def stop(self) -> None:
+        self.timer.reset_timer()
+        self.node_count = 0
+        self.update_text("-- nodes/s")
+
+    def draw(self, surface: pygame.Surface) -> None:
+        surface.blit(self.image, (self.x, self.y))
+
+
 class Score:
+    # The image of every digit by font height, decoded and scaled once and shared by every score (see 'get_digits').
+    digit_sets: Dict[int, Tuple[pygame.Surface, ...]] = {}
+
     def __init__(self, font_height: int = 70, kerning: int = 5):
         """Contains functionality for storing the score and rendering it using an image for each numeric character."""
         self.font_height = font_height
         self.kerning = kerning
-        self.digit_images = []
+        self.digit_images = self.get_digits(font_height)
         self.score = 0
-        for i in range(10):
-            image = pygame.image.load(find_abs_path("./Images/Digits/{}.png".format(i))).convert_alpha()
-            if image.get_height() != self.font_height:
-                new_size = (self.font_height * (image.get_width() / image.get_height()), self.font_height)
-                image = pygame.transform.scale(image, new_size)
-            self.digit_images.append(image)
+
+    @classmethod
+    def get_digits(cls, font_height: int) -> Tuple[pygame.Surface, ...]:
+        """Returns the images of the digits from 0 to 9 at a font height, loading them if they aren't cached yet."""
+        digit_images = cls.digit_sets.get(font_height)
+        if digit_images is None:
+            images = []
+            for i in range(10):
+                image = load_image("./Images/Digits/{}.png".format(i))
+                if image.get_height() != font_height:
+                    new_size = (font_height * (image.get_width() / image.get_height()), font_height)
+                    image = pygame.transform.scale(image, new_size)
+                images.append(image)
+            digit_images = cls.digit_sets[font_height] = tuple(images)
+        return digit_images
 
     def change_score(self, value: int, mode: Literal["set", "change"]) -> None:
         if mode == "set":
@@ -80,9 +130,15 @@ class Score:
         s = str(self.score)
         return sum(self.digit_images[int(d)].get_width() for d in s) + self.kerning * (len(s) - 1), self.font_height
 
-    def draw(self, surface: pygame.Surface, position: Tuple[Union[int, float], Union[int, float]]) -> None:
+    def get_blits(self, position: Tuple[Union[int, float], Union[int, float]]) -> List[tuple]:
+        """Returns the blits that draw the score at 'position', in the format of 'Surface.blits'."""
+        blit_sequence = []
         accumulated_width = 0
         for d in str(self.score):
             digit_surf = self.digit_images[int(d)]
-            surface.blit(digit_surf, (position[0] + accumulated_width, position[1]))
+            blit_sequence.append((digit_surf, (position[0] + accumulated_width, position[1])))
             accumulated_width += digit_surf.get_width() + self.kerning
+        return blit_sequence
+
+    def draw(self, surface: pygame.Surface, position: Tuple[Union[int, float], Union[int, float]]) -> None:
+        surface.blits(self.get_blits(position), doreturn=False)
@@ -332,12 +332,16 @@ class ScoreBoard(Widgets.Frame):
 
 class LoseScreen:
     def __init__(self, parent_frame: Widgets.Frame, resolution: Tuple[int, int], score: "Counters.Score",
-                 callbacks: List[Callable[[], None]], kill_achievement_thread: Callable[[], None]):
+                 callbacks: List[Callable[[], None]], kill_achievement_thread: Callable[[], None],
+                 replay: Optional[bytes] = None):
+        """'replay' is the encoded replay of the round, which is stored along with the score so that it can be
+        verified."""
         self.parent_frame = parent_frame
         self.resolution = resolution
         self.large_font = pygame.font.SysFont("arial", 50)
         self.small_font = pygame.font.SysFont(cjk_fonts, 16)
         self.score = score
+        self.replay = replay
         self.state: Literal["idle", "fetching", "writing"] = "idle"
         self.widget_id = 1
         self.padding = 20
@@ -417,7 +421,7 @@ class LoseScreen:
             current_data.insert(0, {self.db_thread.fields[0]: player_name,
                                     self.db_thread.fields[1]: str(current_score)})
             self.update_scoreboard(current_data)
-            self.db_thread.start_write_score(player_name, current_score)
+            self.db_thread.start_write_score(player_name, current_score, self.replay)
 
 
 class HelpManager:
@@ -0,0 +1,228 @@
+"""
+Gym-style environments for training agents on the game without a window.
+
+'FlappyEnv' plays one round at a time through 'Session.GameSession'. 'VectorEnv' shards many environments across a pool
+of worker processes, with observations, rewards and done flags written straight into shared memory so that stepping
+doesn't have to pickle them. Apart from Pygame, 'VectorEnv' also requires the 'NumPy' module.
+"""
+from Global import *
+import multiprocessing.connection
+import multiprocessing
+import Session
+import random
+import array
+import Bird
+import Pipe
+import os
+if TYPE_CHECKING:
+    import Pixels
+    import numpy
+
+
+class ObservationEncoder:
+    def __init__(self, resolution: Tuple[int, int] = GAME_RESOLUTION, pipe_count: int = 2, normalize: bool = False):
+        """Encodes the state of a round as a flat list of numbers: the bird's y position and speed, followed by the x
+        distance, gap top and gap bottom of each of the next 'pipe_count' pipes. Missing pipes are encoded as a wide
+        open gap at the right edge of the screen. With 'normalize', positions and distances are divided by the screen
+        size and the speed by the bird's terminal velocity."""
+        self.resolution = resolution
+        self.pipe_count = pipe_count
+        self.size = self.calc_size(pipe_count)
+        self.x_scale = 1 / resolution[0] if normalize else 1
+        self.y_scale = 1 / resolution[1] if normalize else 1
+        self.speed_scale = 1 / Bird.Bird.terminal_velocity if normalize else 1
+        self.missing_pipe = (resolution[0] * self.x_scale, 0, resolution[1] * self.y_scale)
+
+    @staticmethod
+    def calc_size(pipe_count: int) -> int:
+        return 2 + 3 * pipe_count
+
+    def encode(self, bird: Bird.Bird, pipe_group: "Pipe.PipeGroup", buffer: Any) -> None:
+        """Writes the observation into 'buffer', which can be anything that supports item assignment of floats, such as
+        an 'array.array', a memoryview or a NumPy array. No containers are created, so this can be called every tick."""
+        x_scale, y_scale = self.x_scale, self.y_scale
+        buffer[0] = bird.real_y * y_scale
+        buffer[1] = bird.current_speed * self.speed_scale
+        xs, gaps = pipe_group.xs, pipe_group.gaps
+        index = pipe_group.get_passed_count()
+        position = 2
+        for _ in range(self.pipe_count):
+            if index < pipe_group.get_pipe_count():
+                # The positions are read from the arrays of the pipe group by slot, without building tuples.
+                slot = pipe_group.get_slot(index)
+                gap_bottom = gaps[slot]
+                buffer[position] = (xs[slot] - bird.constant_x) * x_scale
+                buffer[position + 1] = (gap_bottom - Pipe.Pipe.gap_distance) * y_scale
+                buffer[position + 2] = gap_bottom * y_scale
+                index += 1
+            else:
+                buffer[position], buffer[position + 1], buffer[position + 2] = self.missing_pipe
+            position += 3
+
+    def get_size(self) -> int:
+        return self.size
+
+
+class FlappyEnv:
+    def __init__(self,
+                 resolution: Tuple[int, int] = GAME_RESOLUTION,
+                 tick_rate: int = TICK_RATE,
+                 frame_skip: int = 4,
+                 max_steps: Optional[int] = None,
+                 alive_reward: float = 0.01,
+                 pipe_reward: float = 1,
+                 death_penalty: float = -1,
+                 pipe_count: int = 2,
+                 normalize: bool = False,
+                 pixel_size: Tuple[int, int] = (84, 84),
+                 grayscale: bool = True,
+                 observation: Optional[memoryview] = None):
+        """Each step simulates 'frame_skip' ticks of '1 / tick_rate' seconds, with the action applied on the first tick.
+        Actions are 0 (do nothing) and 1 (jump). Observations are encoded by an 'ObservationEncoder' and written into
+        'observation' in place, which must be a writable buffer of 'observation_size' doubles (a new one is allocated if
+        not given). 'pixel_size' and 'grayscale' configure the frames returned by 'render'."""
+        self.resolution = resolution
+        self.tick_length = 1 / tick_rate
+        self.frame_skip = frame_skip
+        self.max_steps = max_steps
+        self.alive_reward = alive_reward
+        self.pipe_reward = pipe_reward
+        self.death_penalty = death_penalty
+        self.encoder = ObservationEncoder(resolution, pipe_count, normalize)
+        self.observation_size = self.encoder.get_size()
+        self.observation = array.array("d", bytes(8 * self.observation_size)) if observation is None else observation
+        self.pixel_size = pixel_size
+        self.grayscale = grayscale
+        self.renderer: Optional["Pixels.PixelRenderer"] = None
+        self.seed_generator = random.Random()
+        self.session: Optional[Session.GameSession] = None
+        self.step_count = 0
+        self.score = 0
+
+    def reset(self, seed: Optional[int] = None) -> Union[array.array, memoryview]:
+        """Starts a new round and returns the first observation. The round starts with a jump, like a player pressing
+        the space bar to start."""
+        if seed is not None:
+            self.seed_generator.seed(seed)
+        self.session = Session.GameSession(self.resolution, self.seed_generator.getrandbits(32))
+        self.session.jump()
+        self.step_count = 0
+        self.score = 0
+        self.encoder.encode(self.session.get_bird(), self.session.pipe_group, self.observation)
+        return self.observation
+
+    def step(self, action: int) -> Tuple[Union[array.array, memoryview], float, bool, Dict[str, Any]]:
+        session = self.session
+        session.step(self.tick_length, bool(action))
+        for _ in range(self.frame_skip - 1):
+            if not session.is_alive():
+                break
+            session.step(self.tick_length)
+        self.step_count += 1
+        new_score = session.get_score()
+        reward = (new_score - self.score) * self.pipe_reward
+        self.score = new_score
+        alive = session.is_alive()
+        reward += self.alive_reward if alive else self.death_penalty
+        truncated = alive and self.max_steps is not None and self.step_count >= self.max_steps
+        self.encoder.encode(session.get_bird(), session.pipe_group, self.observation)
+        return self.observation, reward, not alive or truncated, {"score": self.score, "steps": self.step_count,
+                                                                  "truncated": truncated}
+
+    def render(self) -> "numpy.ndarray":
+        """Returns a low resolution pixel observation of the current frame. The array is a view that is overwritten by
+        the next call."""
+        if self.renderer is None:
+            import Pixels
+            self.renderer = Pixels.PixelRenderer(self.pixel_size, self.resolution, self.grayscale)
+        return self.renderer.render(self.session)
+
+
+def vector_worker(connection: multiprocessing.connection.Connection, start: int, stop: int,
+                  buffers: Tuple[Any, Any, Any, Any], size: int, env_kwargs: Dict[str, Any]) -> None:
+    """Runs the environments with indices 'start' to 'stop' (exclusive) of a 'VectorEnv' until told to close."""
+    observations, rewards, dones, actions = (memoryview(buffer).cast("B").cast(code)
+                                             for buffer, code in zip(buffers, "ddbb"))
+    envs = [FlappyEnv(observation=observations[i * size:(i + 1) * size], **env_kwargs) for i in range(start, stop)]
+    while True:
+        command, data = connection.recv()
+        if command == "reset":
+            for offset, env in enumerate(envs):
+                env.reset(None if data is None else data + start + offset)
+            connection.send(None)
+        elif command == "step":
+            finished = []
+            for offset, env in enumerate(envs):
+                index = start + offset
+                _, rewards[index], done, info = env.step(actions[index])
+                dones[index] = done
+                if done:
+                    finished.append((index, info))
+                    env.reset()  # Finished environments are reset straight away.
+            connection.send(finished)
+        elif command == "close":
+            connection.close()
+            break
+
+
+class VectorEnv:
+    def __init__(self, env_count: int, worker_count: Optional[int] = None, **env_kwargs):
+        """Runs 'env_count' copies of 'FlappyEnv' across 'worker_count' processes (one per CPU core by default). Keyword
+        arguments are passed to every 'FlappyEnv'. Environments that finish during 'step' are reset automatically, and
+        the observation returned for them is the first observation of their next round."""
+        import numpy
+        self.env_count = env_count
+        self.worker_count = min(env_count, worker_count or os.cpu_count() or 1)
+        size = ObservationEncoder.calc_size(env_kwargs.get("pipe_count", 2))
+        self.buffers = (multiprocessing.RawArray("d", env_count * size), multiprocessing.RawArray("d", env_count),
+                        multiprocessing.RawArray("b", env_count), multiprocessing.RawArray("b", env_count))
+        # NumPy views of the shared buffers. These are updated in place by the workers.
+        self.observations = numpy.frombuffer(self.buffers[0], dtype=numpy.float64).reshape(env_count, size)
+        self.rewards = numpy.frombuffer(self.buffers[1], dtype=numpy.float64)
+        self.dones = numpy.frombuffer(self.buffers[2], dtype=numpy.int8).view(numpy.bool_)
+        self.actions = numpy.frombuffer(self.buffers[3], dtype=numpy.int8)
+        self.connections: List[multiprocessing.connection.Connection] = []
+        self.workers: List[multiprocessing.Process] = []
+        shard_size, remainder = divmod(env_count, self.worker_count)
+        start = 0
+        for worker in range(self.worker_count):
+            stop = start + shard_size + (worker < remainder)
+            parent_end, child_end = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=vector_worker, args=(child_end, start, stop, self.buffers, size,
+                                                                          env_kwargs), daemon=True)
+            process.start()
+            child_end.close()
+            self.connections.append(parent_end)
+            self.workers.append(process)
+            start = stop
+        self.closed = False
+
+    def reset(self, seed: Optional[int] = None) -> "numpy.ndarray":
+        """Resets every environment. Environment 'i' is seeded with 'seed + i' if a seed is given."""
+        for connection in self.connections:
+            connection.send(("reset", seed))
+        for connection in self.connections:
+            connection.recv()
+        return self.observations
+
+    def step(self, actions: Sequence[int]) -> Tuple["numpy.ndarray", "numpy.ndarray", "numpy.ndarray",
+                                                     Dict[int, Dict[str, Any]]]:
+        """Steps every environment with the action at the same index. The info dictionary only contains entries for
+        environments that finished during this step, keyed by their index."""
+        self.actions[:] = actions
+        for connection in self.connections:
+            connection.send(("step", None))
+        infos = {}
+        for connection in self.connections:
+            infos.update(connection.recv())
+        return self.observations, self.rewards, self.dones, infos
+
+    def close(self) -> None:
+        if self.closed:
+            return None
+        self.closed = True
+        for connection in self.connections:
+            connection.send(("close", None))
+            connection.close()
+        for process in self.workers:
+            process.join()
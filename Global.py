@@ -2,6 +2,7 @@ from contextlib import suppress
 from typing import *
 from os import path
 import platform
+import sys
 import pygame.transform
 with suppress(ImportError):
     from ctypes import windll
@@ -22,6 +23,8 @@ GREY5 = (166, 166, 166)
 GREY6 = (96, 96, 96)
 BLACK = (0, 0, 0)
 TRANSPARENT = (1, 1, 1)  # The color used as the transparent color-key throughout the project.
+GAME_RESOLUTION = (641, 858)  # The fixed size of the screen, which rounds are simulated in.
+TICK_RATE = 120  # The number of ticks per second of the fixed timestep, which replays are recorded with.
 
 
 def find_abs_path(rel_path: str) -> str:
@@ -29,6 +32,20 @@ def find_abs_path(rel_path: str) -> str:
     return path.abspath(path.join(path.dirname(__file__), path.normpath(rel_path)))
 
 
+def load_image(rel_path: str) -> pygame.Surface:
+    """Loads an image relative to the project directory. The image is only converted to the display's pixel format if
+    a display surface exists, so game objects can also be created without a window. Without a window, the pixels are
+    reordered to the format of new surfaces instead, which keeps blits between them on the fast path."""
+    image = pygame.image.load(find_abs_path(rel_path))
+    if pygame.display.get_init() and pygame.display.get_surface() is not None:
+        return image.convert_alpha()
+    if not hasattr(pygame.image, "frombytes"):  # Added in Pygame 2.1.3.
+        return image
+    # Byte orders that match the default 32-bit ARGB pixel format of surfaces.
+    byte_order = "BGRA" if sys.byteorder == "little" else "ARGB"
+    return pygame.image.frombytes(pygame.image.tobytes(image, byte_order), image.get_size(), byte_order)
+
+
 def collide_function(sprite1: pygame.sprite.Sprite, sprite2: pygame.sprite.Sprite) -> bool:
     result = pygame.sprite.collide_mask(sprite1, sprite2)
     return result is not None
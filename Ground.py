@@ -1,4 +1,4 @@
-from Global import find_abs_path
+from Global import load_image
 from typing import *
 import pygame
 import Time
@@ -7,7 +7,7 @@ import Time
 class Ground(pygame.sprite.Sprite):
     def __init__(self, resolution: Tuple[int, int]):
         super().__init__()
-        self.tile_image = pygame.image.load(find_abs_path("./Images/Sprites/ground.png")).convert_alpha()
+        self.tile_image = load_image("./Images/Sprites/ground.png")
         self.tile_width, self.tile_height = self.tile_image.get_size()
         self.tile_count = 1
         while self.tile_width * self.tile_count < resolution[0] + self.tile_width:
@@ -41,13 +41,15 @@ class Ground(pygame.sprite.Sprite):
 
 
 class GroundGroup(pygame.sprite.Group):
-    def __init__(self, resolution: Tuple[int, int]):
+    delta_x = -100  # Production movement: -100, Debug movement: -40
+    state_format = "d" + Time.Time.state_format
+
+    def __init__(self, resolution: Tuple[int, int], clock: Optional[Time.BaseClock] = None):
         super().__init__()
         self.resolution = resolution
-        self.delta_x = -100  # Production movement: -100, Debug movement: -40
         self.ground_object = Ground(self.resolution)
         self.add(self.ground_object)
-        self.frame_timer = Time.Time()
+        self.frame_timer = Time.Time(clock)
         self.frame_timer.reset_timer()
 
     def get_size(self) -> Tuple[int, int]:
@@ -62,11 +64,21 @@ class GroundGroup(pygame.sprite.Group):
         self.frame_timer.reset_timer()
         return movement
 
+    def set_x(self, x: float) -> None:
+        self.ground_object.set_x(x)
+
     def reset_pos(self) -> None:
         # if x < 0: x = -(|x| % width)
         if self.ground_object.get_pos()[0] < 0:
             self.ground_object.set_x(-(abs(self.ground_object.get_pos()[0]) % self.ground_object.get_tile_size()[0]))
 
+    def get_state(self) -> tuple:
+        return (self.ground_object.get_pos()[0], *self.frame_timer.get_state())
+
+    def set_state(self, x: float, *timer_state: Union[float, bool]) -> None:
+        self.ground_object.set_x(x)
+        self.frame_timer.set_state(*timer_state)
+
     def pause(self) -> None:
         self.frame_timer.pause()
 
@@ -3,11 +3,11 @@ import Time
 
 
 class KeySequence:
-    def __init__(self, sequence: Tuple[int]):
+    def __init__(self, sequence: Tuple[int], clock: Optional[Time.BaseClock] = None):
         self.correct_keys = sequence
         self.received_keys = []
         self.maximum_delay = 0.5
-        self.delay_timer = Time.Time()
+        self.delay_timer = Time.Time(clock)
         self.delay_timer.reset_timer()
 
     def push_key(self, key_code: int) -> bool:
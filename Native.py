@@ -0,0 +1,161 @@
+"""
+Draws the game world straight into the window at its resolution, instead of drawing the screen at the fixed resolution
+and scaling it up.
+
+The world is drawn from blits in screen coordinates, in the format of 'Surface.blits', whose images are replaced by
+copies scaled to the window, and whose positions are scaled along with them. The copies are made once per window size,
+and the copies of the last few sizes are kept, so that switching back and forth, e.g. to full screen, doesn't scale them
+again. Everything else, such as widgets, dialogs and toasts, is still drawn at the fixed resolution, over the world
+drawn at that resolution like the other presenters draw it, so it blends with the world exactly as it does there.
+Wherever that changed the world, the result is mapped over the world in the window. Every pixel of the window always
+shows the same pixel of the surface, so regions that were mapped in different frames line up exactly. Apart from
+Pygame, this file also requires the 'NumPy' module.
+"""
+from Global import *
+import Presenter
+import weakref
+import numpy
+import pygame
+import math
+
+
+class NativePresenter(Presenter.Presenter):
+    cached_sizes = 3  # The number of window sizes whose scaled images are kept.
+    margin = 2  # Extra pixels drawn around regions, which covers sprites that are a pixel larger once scaled.
+
+    def __init__(self, surface: pygame.Surface, scale_mode: Literal["nearest", "smooth", "integer"] = "smooth"):
+        """Presents what is drawn onto a surface with the size of 'surface' over the world drawn by 'draw_world'. Images
+        are scaled smoothly in the 'smooth' scale mode, except for colorkey images, which are always scaled by nearest
+        neighbour to keep their colorkey exact."""
+        # The surface is opaque like the screen of the other presenters, and gets the pixel format of the window, so its
+        # pixels can be copied into the window as they are.
+        super().__init__(pygame.Surface(surface.get_size()), scale_mode)
+        self.world: Optional[pygame.Surface] = None  # A copy of the world drawn onto the surface, before anything else.
+        # The column and row of the surface that each column and row of the window's target area shows.
+        self.columns = numpy.zeros(0, dtype=numpy.intp)
+        self.rows = numpy.zeros(0, dtype=numpy.intp)
+        self.scale_x = 1
+        self.scale_y = 1
+        # The scaled copies of images by window size, keyed by the original images, which they are dropped along with.
+        self.image_sets: Dict[Tuple[int, int], weakref.WeakKeyDictionary] = {}
+        self.images = weakref.WeakKeyDictionary()
+
+    def calc_layout(self) -> None:
+        width, height = self.surface.get_size()
+        self.calc_target_rect(self.window.get_size())
+        self.calc_bar_rects(self.window.get_size())
+        size = self.target_rect.size
+        self.target = self.window.subsurface(self.target_rect)  # The world is always drawn into the window.
+        self.buffered = False
+        self.scale_x = size[0] / width
+        self.scale_y = size[1] / height
+        # Every pixel shows the pixel of the surface that its center falls into.
+        self.columns = numpy.minimum(((numpy.arange(size[0]) + 0.5) / self.scale_x).astype(numpy.intp), width - 1)
+        self.rows = numpy.minimum(((numpy.arange(size[1]) + 0.5) / self.scale_y).astype(numpy.intp), height - 1)
+        if self.world is None or self.world.get_masks() != self.surface.get_masks():
+            self.world = pygame.Surface((width, height), 0, self.surface)
+        if size in self.image_sets:
+            self.image_sets[size] = self.image_sets.pop(size)  # Moves the size to the end, as the most recently used.
+        else:
+            if len(self.image_sets) >= self.cached_sizes:
+                del self.image_sets[next(iter(self.image_sets))]
+            self.image_sets[size] = weakref.WeakKeyDictionary()
+        self.images = self.image_sets[size]
+        self.repaint = True
+
+    def map_rect(self, rect: pygame.Rect) -> pygame.Rect:
+        """Returns the area of the window's target area that shows 'rect' of the surface."""
+        left, right = numpy.searchsorted(self.columns, (rect.left, rect.right))
+        top, bottom = numpy.searchsorted(self.rows, (rect.top, rect.bottom))
+        return pygame.Rect(int(left), int(top), int(right - left), int(bottom - top))
+
+    def map_region(self, region: pygame.Rect) -> pygame.Rect:
+        """Returns the area of the window's target area that is redrawn for a region of the surface."""
+        return self.map_rect(region).inflate(2 * self.margin, 2 * self.margin).clip(self.target.get_rect())
+
+    def get_image(self, image: pygame.Surface) -> pygame.Surface:
+        """Returns the copy of the image scaled to the window, scaling it if it isn't cached for the window size yet."""
+        scaled_image = self.images.get(image)
+        if scaled_image is None:
+            size = (math.ceil(image.get_width() * self.scale_x), math.ceil(image.get_height() * self.scale_y))
+            colorkey = image.get_colorkey()
+            if colorkey is None and self.scale_mode == "smooth" and image.get_bitsize() >= 24:
+                scaled_image = pygame.transform.smoothscale(image, size)
+            else:
+                scaled_image = pygame.transform.scale(image, size)
+                if colorkey is not None:
+                    scaled_image.set_colorkey(colorkey, pygame.RLEACCEL)
+            self.images[image] = scaled_image
+        return scaled_image
+
+    def prescale(self, images: Iterable[pygame.Surface]) -> None:
+        """Scales the images to the window in advance, unless they are already cached for the window size."""
+        for image in images:
+            self.get_image(image)
+
+    def draw_world(self, blit_sequence: Iterable[tuple]) -> None:
+        """Draws the game world, given as blits in the format of 'Surface.blits', into the window at its resolution.
+        Only the area that shows the clip area of the surface is drawn. The world is also drawn onto the surface and
+        copied, so that what is drawn over it afterwards is blended with it as usual, and can be told apart from it."""
+        blit_sequence = list(blit_sequence)
+        scale_x, scale_y = self.scale_x, self.scale_y
+        blits = []
+        for blit in blit_sequence:
+            x, y = blit[1][0], blit[1][1]
+            position = (round(x * scale_x), round(y * scale_y))
+            if len(blit) > 2:
+                # The edges of the area are scaled along with the position, so it ends where it would when scaled.
+                area = blit[2]
+                blits.append((self.get_image(blit[0]), position,
+                              pygame.Rect(round(area.x * scale_x), round(area.y * scale_y),
+                                          round((x + area.width) * scale_x) - position[0],
+                                          round((y + area.height) * scale_y) - position[1])))
+            else:
+                blits.append((self.get_image(blit[0]), position))
+        self.target.set_clip(self.map_region(self.surface.get_clip()))
+        self.target.blits(blits, doreturn=False)
+        self.target.set_clip(None)
+        super().draw_world(blit_sequence)
+        clip = self.surface.get_clip()
+        self.world.blit(self.surface, clip, clip)
+
+    def draw_regions(self, regions: List[pygame.Rect]) -> List[pygame.Rect]:
+        """Maps the regions of the surface over the world, which has to be drawn into them already, and returns the
+        areas of the window that they cover."""
+        x, y = self.target_rect.topleft
+        rects = []
+        for region in regions:
+            rect = self.map_region(region)
+            if rect.width and rect.height:
+                self.map_surface(rect)
+                rects.append(rect.move(x, y))
+        return rects
+
+    def map_surface(self, rect: pygame.Rect) -> None:
+        """Maps the surface over the world in an area of the window's target area."""
+        source_rect = pygame.Rect(int(self.columns[rect.left]), int(self.rows[rect.top]), 0, 0)
+        source_rect.width = int(self.columns[rect.right - 1]) + 1 - source_rect.x
+        source_rect.height = int(self.rows[rect.bottom - 1]) + 1 - source_rect.y
+        left, top = source_rect.topleft
+        pixels = pygame.surfarray.pixels3d(self.surface)[left:source_rect.right, top:source_rect.bottom]
+        world_pixels = pygame.surfarray.pixels3d(self.world)[left:source_rect.right, top:source_rect.bottom]
+        # Only the pixels that were drawn over the world have to be mapped, which are often none at all. A pixel that
+        # was drawn over with the color of the world already shows that color in the window.
+        changed = (pixels != world_pixels).any(axis=2)
+        del world_pixels  # Unlocks the copy of the world.
+        changed_columns = numpy.flatnonzero(changed.any(axis=1))
+        changed_rows = numpy.flatnonzero(changed.any(axis=0))
+        if not len(changed_columns):
+            return None
+        bounds = pygame.Rect(left + int(changed_columns[0]), top + int(changed_rows[0]),
+                             int(changed_columns[-1] - changed_columns[0]) + 1,
+                             int(changed_rows[-1] - changed_rows[0]) + 1)
+        rect = self.map_rect(bounds).clip(rect)
+        if not rect.width or not rect.height:
+            return None
+        index = numpy.ix_(self.columns[rect.left:rect.right] - left, self.rows[rect.top:rect.bottom] - top)
+        target_pixels = pygame.surfarray.pixels3d(self.target)[rect.left:rect.right, rect.top:rect.bottom]
+        # The surface has the pixel format of the window, so the pixels are copied as they are, and the world drawn into
+        # the window is kept wherever they weren't drawn over.
+        numpy.copyto(target_pixels, pixels[index], where=changed[index][..., numpy.newaxis])
+        del target_pixels, pixels  # Unlocks the surfaces.
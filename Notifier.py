@@ -7,7 +7,7 @@ if TYPE_CHECKING:
 
 class ToastNotifier(pygame.sprite.Sprite):
     def __init__(self, resolution: Tuple[int, int], icon: pygame.Surface, y_pos: int, message_title: str,
-                 message_text: str, toast_id: int):
+                 message_text: str, toast_id: int, clock: Optional[Time.BaseClock] = None):
         super().__init__()
         self.id = toast_id
         self.title_font = pygame.font.SysFont("arial", 25, bold=True)
@@ -56,9 +56,9 @@ class ToastNotifier(pygame.sprite.Sprite):
         self.dest_x = self.resolution[0] - self.width - self.border_padding
         self.remaining_distance = self.resolution[0] - self.dest_x  # Damp this variable every frame.
         self.damping = 0.05  # Damping constant
-        self.delta_time = Time.Time()
+        self.delta_time = Time.Time(clock)
         self.delta_time.reset_timer()
-        self.notification_timer = Time.Time()
+        self.notification_timer = Time.Time(clock)
         self.dismiss_timer = 10
         self.physics = None
         self.acceleration = 550
@@ -162,8 +162,10 @@ class ToastNotifier(pygame.sprite.Sprite):
 
 
 class ToastGroup(pygame.sprite.Group):
-    def __init__(self, resolution: Tuple[int, int], toast_icon: pygame.Surface, z_index: int):
+    def __init__(self, resolution: Tuple[int, int], toast_icon: pygame.Surface, z_index: int,
+                 clock: Optional[Time.BaseClock] = None):
         super().__init__()
+        self.clock = clock
         self.z_index = z_index
         self.resolution = resolution
         self.toast_icon = toast_icon
@@ -176,7 +178,7 @@ class ToastGroup(pygame.sprite.Group):
         new_toast = ToastNotifier(self.resolution, self.toast_icon,
                                   (self.padding * (len(self.toasts) + 1)
                                    + sum(toast.get_size()[1] for toast in self.toasts)), toast_title, toast_text,
-                                  self.assign_id)
+                                  self.assign_id, self.clock)
         self.toasts.append(new_toast)
         self.add(new_toast)
         self.assign_id += 1
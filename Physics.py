@@ -1,14 +1,15 @@
+from typing import *
 import math
 import Time
 
 
 class Wiggle:
-    def __init__(self):
+    def __init__(self, clock: Optional[Time.BaseClock] = None):
         self.frequency = 3.3
         self.v_shift = 30
         # Note to self: Period of a normal sin graph is '2𝜋', giving a coefficient 'b' to 'x' makes the period '2𝜋 / b'.
         self.period = (2 * math.pi) / self.frequency
-        self.elapsed_time = Time.Time()
+        self.elapsed_time = Time.Time(clock)
         self.elapsed_time.reset_timer()
 
     def get_y_pos(self) -> float:
@@ -19,6 +20,12 @@ class Wiggle:
         y = self.v_shift * math.sin(self.frequency * x) + self.v_shift
         return y
 
+    def get_state(self) -> Tuple[float, float, bool]:
+        return self.elapsed_time.get_state()
+
+    def set_state(self, *state: Union[float, bool]) -> None:
+        self.elapsed_time.set_state(*state)
+
     def max_vertical_movement(self) -> int:
         return self.v_shift * 2
 
@@ -28,3 +35,81 @@ class Wiggle:
     def unpause(self) -> None:
         if self.elapsed_time.is_paused():
             self.elapsed_time.unpause()
+
+
+class Trajectory:
+    def __init__(self, y: float, speed: float, gravity: float, terminal_velocity: float, tick_length: float = 0):
+        """
+        The motion of a body that accelerates downwards with 'gravity' until it reaches 'terminal_velocity', starting at
+        the y position 'y' with 'speed' (positive values are downwards). The motion is a parabola followed by a straight
+        line, so every query is answered in closed form without stepping.
+
+        If 'tick_length' is given, positions are exact for a fixed time step that adds gravity to the speed before
+        moving, like 'Bird.calculate_movement' does. Positions are then only exact at whole ticks, and the times
+        returned by the queries are rounded up to whole ticks.
+        """
+        self.y = y
+        self.speed = speed
+        self.gravity = gravity
+        self.terminal_velocity = terminal_velocity
+        self.tick_length = tick_length
+        # Stepping adds half a tick's worth of gravity to the speed of every tick, compared to the continuous motion.
+        self.start_speed = speed + gravity * tick_length / 2
+        if tick_length > 0:
+            # The last tick before the speed is capped.
+            ticks = max(math.ceil((terminal_velocity - speed) / (gravity * tick_length)) - 1, 0)
+            self.cap_time = ticks * tick_length
+        else:
+            self.cap_time = max((terminal_velocity - speed) / gravity, 0)
+        self.cap_y = self.y + self.start_speed * self.cap_time + gravity * self.cap_time ** 2 / 2
+
+    def get_y(self, t: float) -> float:
+        """Returns the y position after 't' seconds."""
+        if t <= self.cap_time:
+            return self.y + self.start_speed * t + self.gravity * t ** 2 / 2
+        return self.cap_y + self.terminal_velocity * (t - self.cap_time)
+
+    def get_speed(self, t: float) -> float:
+        return min(self.speed + self.gravity * t, self.terminal_velocity)
+
+    def get_apex(self) -> Tuple[float, float]:
+        """Returns the time and y position of the highest point of the motion, which is the start if the body isn't
+        moving upwards."""
+        t = min(max(-self.start_speed / self.gravity, 0), self.cap_time)
+        if self.tick_length > 0:
+            # The highest whole tick is the one before or after the top of the parabola, whichever is higher.
+            t = min(math.floor(t / self.tick_length) * self.tick_length, math.ceil(t / self.tick_length) *
+                    self.tick_length, key=self.get_y)
+        return t, self.get_y(t)
+
+    def time_to_y(self, y: float, start: float = 0) -> Optional[float]:
+        """Returns the earliest time from 'start' on at which the body reaches the y position 'y', or None if it never
+        does."""
+        if self.get_y(start) == y:
+            return start
+        if start < self.cap_time:
+            # Solve 'gravity / 2 * t^2 + start_speed * t + (self.y - y) = 0'.
+            a, b, c = self.gravity / 2, self.start_speed, self.y - y
+            discriminant = b ** 2 - 4 * a * c
+            if discriminant >= 0:
+                root = math.sqrt(discriminant)
+                for t in sorted(((-b - root) / (2 * a), (-b + root) / (2 * a))):
+                    if start <= t <= self.cap_time:
+                        return self.round_time(t)
+        t = self.cap_time + (y - self.cap_y) / self.terminal_velocity
+        return self.round_time(t) if t >= max(start, self.cap_time) else None
+
+    def time_to_impact(self, top: float, bottom: float, start: float, end: float) -> Optional[float]:
+        """Returns the earliest time between 'start' and 'end' at which the y position reaches 'top' or 'bottom', such
+        as the limits that the bird's y position has to stay within while it passes a pipe. None is returned if it
+        stays between them."""
+        if not top < self.get_y(start) < bottom:
+            return start
+        times = [t for t in (self.time_to_y(top, start), self.time_to_y(bottom, start)) if t is not None and t <= end]
+        return min(times, default=None)
+
+    def round_time(self, t: float) -> float:
+        """Rounds a time up to a whole tick if the trajectory is stepped, allowing for rounding errors."""
+        if self.tick_length > 0:
+            return math.ceil(t / self.tick_length - 1e-9) * self.tick_length
+        return t
@@ -1,6 +1,7 @@
 from Global import *
 import Counters
 import Time
+import array
 import math
 import random
 import pygame
@@ -8,40 +9,182 @@ if TYPE_CHECKING:
     import Bird
 
 
-class Pipe(pygame.sprite.Sprite):
-    def __init__(self, x_pos: int, resolution: Tuple[int, int], ground_size: Tuple[int, int]):
-        super().__init__()
-        self.pipe_image = pygame.image.load(find_abs_path("./Images/Sprites/pipe.png")).convert_alpha()
+class Course:
+    # The seed of the course and the index of the next gap, which the rest of the course is rebuilt from.
+    state_format = "QI"
+
+    def __init__(self, gap_range: Tuple[int, int], seed: Optional[int] = None, block_size: int = 0):
+        """Generates the gap positions of a round's pipes from its own random generator, so that the same seed always
+        produces the same course. Gap positions are the y position of the top of each bottom pipe, within 'gap_range'
+        (inclusive). The course is an endless iterator of gap positions. A random seed is picked if 'seed' is None.
+
+        Every gap that has been generated is kept in an array, so restoring an earlier state only moves the index back.
+        If 'block_size' is positive, gaps are precomputed 'block_size' at a time, so that spawning pipes doesn't have to
+        use the random generator. The sequence of gaps is the same either way."""
+        self.gap_range = gap_range
+        self.seed = random.getrandbits(32) if seed is None else seed
+        self.rng = random.Random(self.seed)
+        self.block_size = block_size
+        self.gaps = array.array("H")
+        self.index = 0  # The index of the next gap.
+        if block_size > 0:
+            self.generate(block_size)
+
+    @staticmethod
+    def calc_gap_range(resolution: Tuple[int, int], ground_size: Tuple[int, int]) -> Tuple[int, int]:
+        return Pipe.min_length + Pipe.gap_distance, resolution[1] - ground_size[1] - Pipe.min_length
+
+    def generate(self, count: int) -> None:
+        """Appends the next 'count' gaps of the course to the array."""
+        self.gaps.extend(self.rng.randint(*self.gap_range) for _ in range(count))
+
+    def __iter__(self) -> "Course":
+        return self
+
+    def __next__(self) -> int:
+        if self.index >= len(self.gaps):
+            self.generate(max(self.block_size, 1))
+        self.index += 1
+        return self.gaps[self.index - 1]
+
+    def get_block(self) -> array.array:
+        """Returns the gaps that have been generated but not used yet."""
+        return self.gaps[self.index:]
+
+    def get_state(self) -> Tuple[int, int]:
+        return self.seed, self.index
+
+    def set_state(self, seed: int, index: int) -> None:
+        """Restores a state returned by 'get_state'. Only the gaps that haven't been generated yet are generated, unless
+        the state is from a course with a different seed, which is generated again from the start."""
+        if seed != self.seed:
+            self.seed = seed
+            self.rng.seed(seed)
+            del self.gaps[:]
+        if index > len(self.gaps):
+            self.generate(max(index - len(self.gaps), self.block_size))
+        self.index = index
+
+
+class Pipe:
+    gap_distance = 145
+    min_length = 66
+    # Brightness, flash movement, then the flash timer.
+    state_format = "hh" + Time.Time.state_format
+    # The pipe image and its vertically flipped copy, decoded once and shared by every pipe (see 'load_images').
+    pipe_image: Optional[pygame.Surface] = None
+    flipped_image: Optional[pygame.Surface] = None
+    # The bottom and top pipe on a colorkey background, which every pipe is drawn from.
+    bottom_surface: Optional[pygame.Surface] = None
+    top_surface: Optional[pygame.Surface] = None
+    # The solid area of the pipe image as (left, top, right, bottom) rectangles, shared by every pipe.
+    shape_rects: Optional[Tuple[Tuple[int, int, int, int], ...]] = None
+    # The top and bottom images of the death flash, brightened by multiples of 'flash_step'. They are shared by every
+    # pipe and built the first time a brightness level is reached, or all at once by 'get_images', so the flash doesn't
+    # draw anything per frame.
+    flash_step = 15
+    max_brightness = 150
+    flash_frames: Dict[int, Tuple[pygame.Surface, pygame.Surface]] = {}
+
+    def __init__(self, gap_y: int, resolution: Tuple[int, int], ground_size: Tuple[int, int],
+                 clock: Optional[Time.BaseClock] = None):
+        """A top and bottom pipe around a gap, whose bottom pipe starts at the y position 'gap_y'. The x position of the
+        pipe is kept by its 'PipeGroup', which also recycles pipes with 'reset' instead of creating new ones. Pipes
+        don't have surfaces of their own, and are drawn from the shared images by 'PipeGroup.draw'."""
+        self.load_images()
         self.width, self.height = self.pipe_image.get_size()
         self.resolution = list(resolution)
         self.resolution[1] -= ground_size[1]
-        self.x = x_pos
-        self.y = 0
-        self.gap_distance = 145
-        self.min_length = 66
-        self.bottom_pipe_pos = (0, random.randint(self.min_length + self.gap_distance,
-                                                  self.resolution[1] - self.min_length))
+        self.bottom_pipe_pos = (0, gap_y)
         self.top_pipe_pos = (0, self.bottom_pipe_pos[1] - self.gap_distance - self.height)
-        self.bird_passed = False
-        self.image = pygame.Surface((self.width, self.resolution[1]))
-        # Use the RLEACCEL flag to improve blit performance, since the surface is only modified on creation.
-        self.image.set_colorkey(TRANSPARENT, pygame.RLEACCEL)
-        self.image.fill(TRANSPARENT)
-        self.image.blit(self.pipe_image, self.bottom_pipe_pos)
-        self.image.blit(pygame.transform.flip(self.pipe_image, False, True), self.top_pipe_pos)
+        self.bottom_area = pygame.Rect(0, 0, 0, 0)  # The part of the bottom pipe above the ground.
+        self.images = (self.top_surface, self.bottom_surface)  # The images the pipe is currently drawn with.
+        self.hit_rects: List[Tuple[int, int, int, int]] = []  # Both pipes' 'shape_rects', relative to the pipe.
         # region Brightness Variables
-        self.original_surface = self.image.copy()
         self.brightness = 1
-        self.max_brightness = 150
         self.flash_movement = 300
-        self.flash_timer = Time.Time()
+        self.flash_timer = Time.Time(clock)
         # endregion
-        self.rect = pygame.Rect(self.x, self.y, self.width, self.resolution[1])
-        self.mask = pygame.mask.from_surface(self.image)
+        self.calc_geometry()
+
+    @classmethod
+    def load_images(cls) -> None:
+        """Decodes the shared pipe images, unless they have been already."""
+        if cls.pipe_image is None:
+            cls.pipe_image = load_image("./Images/Sprites/pipe.png")
+            cls.flipped_image = pygame.transform.flip(cls.pipe_image, False, True)
+            cls.bottom_surface, cls.top_surface = (cls.convert_image(image)
+                                                   for image in (cls.pipe_image, cls.flipped_image))
+            cls.shape_rects = cls.calc_shape_rects(cls.pipe_image)
+
+    @staticmethod
+    def convert_image(image: pygame.Surface) -> pygame.Surface:
+        """Returns a copy of the image on a colorkey background, which is faster to draw than per-pixel alpha."""
+        surface = pygame.Surface(image.get_size())
+        surface.fill(TRANSPARENT)
+        surface.blit(image, (0, 0))
+        # Use the RLEACCEL flag to improve blit performance, since the surface is never modified.
+        surface.set_colorkey(TRANSPARENT, pygame.RLEACCEL)
+        return surface
+
+    @classmethod
+    def get_images(cls) -> List[pygame.Surface]:
+        """Returns every image that pipes are drawn with, building the frames of the death flash that aren't yet."""
+        cls.load_images()
+        images = [cls.top_surface, cls.bottom_surface]
+        for level in range(cls.flash_step, cls.max_brightness, cls.flash_step):
+            images.extend(cls.get_flash_frame(level))
+        return images
 
-    def update(self, movement: Union[int, float]) -> None:
-        self.x += movement
-        self.rect = pygame.Rect(self.x, self.y, self.width, self.resolution[1])
+    @classmethod
+    def get_image_size(cls) -> Tuple[int, int]:
+        cls.load_images()
+        return cls.pipe_image.get_size()
+
+    def calc_geometry(self) -> None:
+        """Updates the visible area of the bottom pipe and the hit rectangles after the gap has moved."""
+        self.bottom_area.size = (self.width, max(self.resolution[1] - self.bottom_pipe_pos[1], 0))
+        self.hit_rects.clear()
+        flipped_bottom = self.top_pipe_pos[1] + self.height
+        for left, top, right, bottom in self.shape_rects:
+            for rect_top, rect_bottom in ((self.bottom_pipe_pos[1] + top, self.bottom_pipe_pos[1] + bottom),
+                                          (flipped_bottom - bottom, flipped_bottom - top)):
+                # Clip to the screen above the ground, like the drawing is.
+                rect_top, rect_bottom = max(rect_top, 0), min(rect_bottom, self.resolution[1])
+                if rect_top < rect_bottom:
+                    self.hit_rects.append((left, rect_top, right, rect_bottom))
+
+    @staticmethod
+    def calc_shape_rects(image: pygame.Surface) -> Tuple[Tuple[int, int, int, int], ...]:
+        """Splits the solid pixels of the image into rectangles of consecutive rows that span the same columns. Rows are
+        assumed to be a single span, which holds for the pipe image."""
+        mask = pygame.mask.from_surface(image)
+        row = pygame.mask.Mask((mask.get_size()[0], 1), fill=True)
+        rects = []
+        for y in range(mask.get_size()[1]):
+            spans = mask.overlap_mask(row, (0, y)).get_bounding_rects()
+            if not spans:
+                continue
+            span = spans[0].unionall(spans[1:])
+            if rects and rects[-1][3] == y and rects[-1][0] == span.left and rects[-1][2] == span.right:
+                rects[-1] = (span.left, rects[-1][1], span.right, y + 1)
+            else:
+                rects.append((span.left, y, span.right, y + 1))
+        return tuple(rects)
+
+    def set_gap(self, gap_y: int) -> None:
+        """Moves the gap so that the bottom pipe starts at 'gap_y'."""
+        self.bottom_pipe_pos = (0, gap_y)
+        self.top_pipe_pos = (0, self.bottom_pipe_pos[1] - self.gap_distance - self.height)
+        self.calc_geometry()
+
+    def reset(self, gap_y: int) -> None:
+        """Reuses the pipe for a new gap, as if it was just created."""
+        self.brightness = 1
+        self.flash_movement = abs(self.flash_movement)
+        self.flash_timer.set_state(0, 0, False)
+        self.images = (self.top_surface, self.bottom_surface)
+        self.set_gap(gap_y)
 
     def init_flash(self) -> None:
         self.flash_timer.reset_timer()
@@ -49,17 +192,34 @@ class Pipe(pygame.sprite.Sprite):
     def flash_tick(self) -> bool:
         delta_time = self.flash_timer.get_time()
         self.flash_timer.reset_timer()
-        self.image = self.original_surface.copy()
         self.brightness += round(self.flash_movement * delta_time)
         if self.brightness >= self.max_brightness:
             self.brightness = self.max_brightness - 1
             self.flash_movement = -self.flash_movement
         elif self.brightness <= 0:
             self.brightness = 0
-        self.image.set_colorkey((self.brightness + TRANSPARENT[0],) * 3)
-        self.image.fill((self.brightness,) * 3, special_flags=pygame.BLEND_RGB_ADD)
+        self.apply_brightness()
         return self.brightness == 0
 
+    def apply_brightness(self) -> None:
+        self.images = self.get_flash_frame(self.brightness)
+
+    @classmethod
+    def get_flash_frame(cls, brightness: int) -> Tuple[pygame.Surface, pygame.Surface]:
+        """Returns the top and bottom images brightened by 'brightness', rounded down to a multiple of 'flash_step'."""
+        level = brightness - brightness % cls.flash_step
+        if level == 0:
+            return cls.top_surface, cls.bottom_surface
+        if level not in cls.flash_frames:
+            frame = []
+            for image in (cls.top_surface, cls.bottom_surface):
+                image = image.copy()
+                image.fill((level,) * 3, special_flags=pygame.BLEND_RGB_ADD)
+                image.set_colorkey((level + TRANSPARENT[0],) * 3, pygame.RLEACCEL)  # The background was brightened too.
+                frame.append(image)
+            cls.flash_frames[level] = (frame[0], frame[1])
+        return cls.flash_frames[level]
+
     def flash_pause(self) -> None:
         self.flash_timer.pause()
 
@@ -67,46 +227,162 @@ class Pipe(pygame.sprite.Sprite):
         if self.flash_timer.is_paused():
             self.flash_timer.unpause()
 
-    def check_collision(self) -> bool:
-        if self.x < -self.width:
-            self.kill()
-            return True
-        else:
-            return False
-
-    def check_passed(self, bird: "Bird.Bird") -> bool:
-        if self.bird_passed:
-            return False
-        pipe_mid = self.x + self.width / 2
-        bird_mid = bird.x + bird.get_rect().width / 2
-        if pipe_mid <= bird_mid:
-            self.bird_passed = True
-            return True
-
     def get_size(self) -> Tuple[int, int]:
         return self.width, self.height
 
-    def get_pos(self) -> Tuple[int, int]:
-        return self.x, self.y
+    def get_hit_rects(self, x: float) -> Iterator[Tuple[int, int, int, int]]:
+        """Yields the solid areas of both pipes as (left, top, right, bottom) rectangles in screen coordinates, with the
+        pipe at the x position 'x'."""
+        x = int(x)  # Truncated like the position of a rect.
+        for left, top, right, bottom in self.hit_rects:
+            yield left + x, top, right + x, bottom
+
+    def get_gap(self) -> int:
+        return self.bottom_pipe_pos[1]
+
+    def get_blits(self, x: int) -> Tuple[Tuple[pygame.Surface, Tuple[int, int]],
+                                         Tuple[pygame.Surface, Tuple[int, int], pygame.Rect]]:
+        """Returns the blits that draw the pipe at the x position 'x', in the format of 'Surface.blits'."""
+        return (self.images[0], (x, self.top_pipe_pos[1])), (self.images[1], (x, self.bottom_pipe_pos[1]),
+                                                              self.bottom_area)
 
+    def get_state(self) -> tuple:
+        return (self.brightness, self.flash_movement, *self.flash_timer.get_state())
+
+    def set_state(self, brightness: int, flash_movement: int, *timer_state: Union[float, bool]) -> None:
+        self.brightness = brightness
+        self.flash_movement = flash_movement
+        self.flash_timer.set_state(*timer_state)
+        if self.brightness == 1 and self.flash_movement > 0:
+            self.images = (self.top_surface, self.bottom_surface)  # The pipe hasn't started flashing.
+        else:
+            self.apply_brightness()
+
+
+class PipeGroup:
+    pipe_distance = 213
+    state_format = "?hIH"  # Pipes initialized, index of the flashing pipe, score, number of pipes.
+    # The x position, gap position and whether the bird has passed it, followed by the state of the 'Pipe'. Snapshots
+    # store one of these for every pipe, from right to left.
+    pipe_state_format = "di?" + Pipe.state_format
+    initial_capacity = 8
 
-class PipeGroup(pygame.sprite.Group):
     def __init__(self,
                  resolution: Tuple[int, int],
                  ground_size: Tuple[int, int],
                  font_height: int = 70,
-                 kerning: int = 5):
-        super().__init__()
+                 kerning: int = 5,
+                 clock: Optional[Time.BaseClock] = None,
+                 course: Optional[Course] = None):
         self.resolution = resolution
         self.ground_size = ground_size
-        self.temp = Pipe(-1, resolution, self.ground_size)
+        self.clock = clock
+        self.course = course  # Gaps are picked with the global generator of the 'random' module if None.
+        self.gap_range = Course.calc_gap_range(resolution, ground_size)
+        self.width = Pipe.get_image_size()[0]
+        self.floor_y = resolution[1] - ground_size[1]
         self.score = Counters.Score(font_height, kerning)
-        self.sprite_objects: List[Pipe] = []
-        self.pipe_distance = 213
+        # region Pipe Field
+        # The pipes are kept from left to right in a ring buffer of slots starting at 'first', so pipes are spawned on
+        # the right and despawned on the left without moving the others. The x positions and gaps of the slots are
+        # stored in contiguous arrays, and the 'Pipe' objects only hold what is needed to draw them.
+        self.xs = array.array("d", bytes(8 * self.initial_capacity))
+        self.gaps = array.array("H", bytes(2 * self.initial_capacity))
+        self.pipes: List[Optional[Pipe]] = [None] * self.initial_capacity
+        self.first = 0
+        self.count = 0
+        self.passed_count = 0  # The number of pipes that the bird has passed, which is the index of the next pipe.
+        # Despawned pipes, which are reused by 'spawn'. It starts with enough pipes to fill the screen, so that pipes
+        # don't have to be created during a round.
+        self.pool = [Pipe(self.gap_range[0], self.resolution, self.ground_size, self.clock)
+                     for _ in range(resolution[0] // (self.width + self.pipe_distance) + 2)]
+        # endregion
         self.collide_init = False
         self.flash_pipe: Optional[Pipe] = None  # Stores the pipe object that has to be flashed.
 
-    def set_flash_pipe(self, pipe_obj: pygame.sprite.Sprite) -> None:
+    # region Pipe Field
+    def get_slot(self, index: int) -> int:
+        """Returns the slot of the pipe at 'index', counting from the left."""
+        return (self.first + index) % len(self.pipes)
+
+    def iter_slots(self, start: int = 0) -> Iterator[int]:
+        """Yields the slots of the pipes from the left, starting at the pipe at index 'start'."""
+        capacity = len(self.pipes)
+        for index in range(self.first + start, self.first + self.count):
+            yield index % capacity
+
+    def next_gap(self) -> int:
+        return random.randint(*self.gap_range) if self.course is None else next(self.course)
+
+    def spawn(self, x: float, gap_y: int) -> None:
+        """Adds a pipe to the right of the others."""
+        if self.count == len(self.pipes):
+            self.grow()
+        slot = self.get_slot(self.count)
+        self.xs[slot] = x
+        self.gaps[slot] = gap_y
+        if self.pool:
+            self.pipes[slot] = self.pool.pop()
+            self.pipes[slot].reset(gap_y)
+        else:
+            self.pipes[slot] = Pipe(gap_y, self.resolution, self.ground_size, self.clock)
+        self.count += 1
+
+    def despawn(self) -> None:
+        """Removes the leftmost pipe."""
+        self.recycle(self.pipes[self.first])
+        self.pipes[self.first] = None
+        self.first = (self.first + 1) % len(self.pipes)
+        self.count -= 1
+        self.passed_count = max(self.passed_count - 1, 0)
+
+    def grow(self) -> None:
+        """Doubles the number of slots, for screens that are wide enough to fit more pipes than there are slots."""
+        slots = list(self.iter_slots())
+        capacity = 2 * len(self.pipes)
+        xs = array.array("d", bytes(8 * capacity))
+        gaps = array.array("H", bytes(2 * capacity))
+        pipes: List[Optional[Pipe]] = [None] * capacity
+        for index, slot in enumerate(slots):
+            xs[index], gaps[index], pipes[index] = self.xs[slot], self.gaps[slot], self.pipes[slot]
+        self.xs, self.gaps, self.pipes = xs, gaps, pipes
+        self.first = 0
+
+    def recycle(self, pipe: Pipe) -> None:
+        """Puts a despawned pipe back into the pool, unless it's still flashing."""
+        if pipe is not self.flash_pipe:
+            self.pool.append(pipe)
+
+    def clear(self) -> None:
+        for slot in self.iter_slots():
+            self.recycle(self.pipes[slot])
+            self.pipes[slot] = None
+        self.first = self.count = self.passed_count = 0
+
+    def shift(self, movement: float) -> None:
+        """Moves every pipe horizontally, in a single pass over their x positions."""
+        xs = self.xs
+        for slot in self.iter_slots():
+            xs[slot] += movement
+
+    def get_pipe_count(self) -> int:
+        return self.count
+
+    def get_passed_count(self) -> int:
+        return self.passed_count
+
+    def get_pipe_pos(self, index: int) -> Tuple[float, int]:
+        """Returns the x position and gap position of the pipe at 'index', counting from the left."""
+        slot = self.get_slot(index)
+        return self.xs[slot], self.gaps[slot]
+
+    def iter_pipe_pos(self, start: int = 0) -> Iterator[Tuple[float, int]]:
+        """Yields the x positions and gap positions of the pipes from the left, starting at the pipe at 'start'."""
+        for slot in self.iter_slots(start):
+            yield self.xs[slot], self.gaps[slot]
+    # endregion
+
+    def set_flash_pipe(self, pipe_obj: Pipe) -> None:
         self.flash_pipe = pipe_obj
 
     def update_flash_pipe(self) -> None:
@@ -123,59 +399,128 @@ class PipeGroup(pygame.sprite.Group):
 
     def generate(self) -> None:
         if self.collide_init:
-            self.sprite_objects = [
-                Pipe(x, self.resolution, self.ground_size) for x in range(self.resolution[0], -self.temp.get_size()[0],
-                                                                          -(self.temp.get_size()[0]
-                                                                            + self.pipe_distance))
-            ]
-            self.add(self.sprite_objects)
+            positions = range(self.resolution[0], -self.width, -(self.width + self.pipe_distance))
+            gaps = [self.next_gap() for _ in positions]  # Gaps are taken from right to left.
+            for x, gap_y in zip(reversed(positions), reversed(gaps)):
+                self.spawn(x, gap_y)
         else:
-            self.sprite_objects.append(Pipe(self.resolution[0], self.resolution, self.ground_size))
-            self.add(self.sprite_objects[-1])
-
-    def move(self, distance: float, bird: "Bird.Bird") -> Optional[pygame.sprite.Sprite]:
-        pipe_width = self.temp.get_size()[0]
-        shift_count, remainder = divmod(abs(distance), pipe_width)
-        shift_count = math.floor(shift_count)
-        shift_amount = math.copysign(pipe_width, distance)
-        remainder = math.copysign(remainder, distance)
-        for i in range(shift_count + 1):
-            temp_amount = remainder if i == shift_count else shift_amount
-            if temp_amount == 0:
+            self.spawn(self.resolution[0], self.next_gap())
+
+    def move(self, distance: float, bird: "Bird.Bird") -> Optional[Pipe]:
+        """Moves the pipes horizontally, stopping them where they first touch the bird. Returns the pipe that was hit,
+        if any."""
+        hit_pipe = None
+        shift = distance
+        bird_rect = bird.get_rect()
+        # Only the pipes that pass over the bird's columns during the movement can hit it.
+        reach = math.ceil(abs(distance))
+        for pipe, x, (left, top, right, bottom) in self.iter_hit_rects(bird_rect.x - reach, bird_rect.right + reach):
+            extent = bird.row_extent(top - bird_rect.y, bottom - bird_rect.y)
+            if extent is None:
+                continue
+            bird_left, bird_right = bird_rect.x + extent[0], bird_rect.x + extent[1]
+            # The pipe x position at which the rectangle touches the bird from the direction it is moving in.
+            if distance < 0 and right > bird_left:
+                contact = bird_right - left + int(x)
+                if x + distance >= contact:
+                    continue
+            elif distance > 0 and left < bird_right:
+                contact = bird_left - right + int(x)
+                if x + distance < contact + 1:
+                    continue
+            else:
                 continue
-            self.update(temp_amount)
-            result = pygame.sprite.spritecollideany(bird, self, collided=collide_function)
-            if result is not None:
-                opposite_amount = -math.copysign(1, temp_amount)
-                collided = 0
-                while collided is not None:
-                    self.update(opposite_amount)
-                    collided = pygame.sprite.spritecollideany(bird, self, collided=collide_function)
-                return result
-        self.check_score(bird)
+            if (contact - x) * distance < shift * distance or hit_pipe is None:
+                hit_pipe = pipe
+                shift = contact - x
+        self.shift(shift)
+        if hit_pipe is None:
+            self.check_score(bird)
+        return hit_pipe
+
+    def iter_hit_rects(self, left: int, right: int) -> Iterator[Tuple[Pipe, float, Tuple[int, int, int, int]]]:
+        """Yields each hit rectangle of the pipes that horizontally overlap the columns 'left' to 'right' (exclusive),
+        together with its pipe and the pipe's x position. Only the pipes around the columns are visited, however many
+        there are."""
+        for slot in self.iter_slots():
+            x = self.xs[slot]
+            if int(x) >= right:
+                break
+            if int(x) + self.width > left:
+                pipe = self.pipes[slot]
+                for rect in pipe.get_hit_rects(x):
+                    yield pipe, x, rect
+
+    def collide_bird(self, bird: "Bird.Bird") -> Optional[Pipe]:
+        """Returns a pipe that the bird is overlapping, or None."""
+        bird_rect = bird.get_rect()
+        for pipe, _, rect in self.iter_hit_rects(bird_rect.x, bird_rect.right):
+            if bird.overlaps_rect(rect):
+                return pipe
+        return None
 
     def check_score(self, bird: "Bird.Bird") -> None:
-        for pipe in self.sprite_objects:
-            if pipe.check_passed(bird):
+        """Scores the next pipe once the bird is past its middle."""
+        if self.passed_count < self.count:
+            pipe_mid = self.xs[self.get_slot(self.passed_count)] + self.width / 2
+            if pipe_mid <= bird.x + bird.get_rect().width / 2:
+                self.passed_count += 1
                 self.score.change_score(1, "change")
-                break
 
     def kill_colliding(self) -> None:
         if not self.collide_init:
             self.collide_init = True
-        self.sprite_objects[:] = [pipe for pipe in self.sprite_objects if not pipe.check_collision()]
-        if len(self.sprite_objects) == 0:
+        while self.count and self.xs[self.first] < -self.width:
+            self.despawn()
+        if self.count == 0:
             self.generate()
             return None
-        while self.sprite_objects[0].get_pos()[0] < self.resolution[0] - self.temp.get_size()[0] - self.pipe_distance:
-            self.sprite_objects.insert(0, Pipe(self.sprite_objects[0].get_pos()[0]
-                                               + self.temp.get_size()[0]
-                                               + self.pipe_distance, self.resolution, self.ground_size))
-            self.add(self.sprite_objects[0])
+        rightmost_x = self.xs[self.get_slot(self.count - 1)]
+        while rightmost_x < self.resolution[0] - self.width - self.pipe_distance:
+            rightmost_x = rightmost_x + self.width + self.pipe_distance  # Summed in this order to keep replays valid.
+            self.spawn(rightmost_x, self.next_gap())
+
+    def get_state(self) -> Tuple[Tuple[bool, int, int, int], List[tuple]]:
+        """Returns the state of the group itself, followed by the state of every pipe from right to left."""
+        flash_index = -1
+        pipe_states = []
+        for index in reversed(range(self.count)):
+            slot = self.get_slot(index)
+            if self.flash_pipe is not None and self.pipes[slot] is self.flash_pipe:
+                flash_index = len(pipe_states)
+            pipe_states.append((self.xs[slot], self.gaps[slot], index < self.passed_count,
+                                *self.pipes[slot].get_state()))
+        return (self.collide_init, flash_index, self.score.get_score(), self.count), pipe_states
+
+    def set_state(self, collide_init: bool, flash_index: int, score: int, pipe_states: List[tuple]) -> None:
+        """Restores a state returned by 'get_state'. The pipes are rebuilt from the stored gaps, so the course isn't
+        used."""
+        self.flash_pipe = None
+        self.clear()
+        for index, (x, gap_y, passed, *state) in enumerate(reversed(pipe_states)):
+            self.spawn(x, gap_y)
+            pipe = self.pipes[self.get_slot(index)]
+            pipe.set_state(*state)
+            self.passed_count += passed
+            if len(pipe_states) - 1 - index == flash_index:
+                self.flash_pipe = pipe
+        self.collide_init = collide_init
+        self.score.change_score(score, "set")
+
+    def get_blit_sequence(self) -> List[tuple]:
+        """Returns the blits that draw every pipe, in the format of 'Surface.blits'."""
+        blit_sequence = []
+        for slot in self.iter_slots():
+            blit_sequence.extend(self.pipes[slot].get_blits(int(self.xs[slot])))
+        return blit_sequence
+
+    def draw(self, surface: pygame.Surface) -> None:
+        """Draws every pipe with a single call to 'Surface.blits'."""
+        surface.blits(self.get_blit_sequence(), doreturn=False)
 
     def draw_hit_box(self, surface: pygame.Surface) -> None:
-        for pipe in self.sprite_objects:
-            pygame.draw.rect(surface, BLACK, pipe.rect, 1)
+        for slot in self.iter_slots():
+            pygame.draw.rect(surface, BLACK, (int(self.xs[slot]), 0, self.width, self.floor_y), 1)
 
     def get_score_obj(self) -> Counters.Score:
         return self.score
@@ -0,0 +1,115 @@
+"""
+Renders low resolution pixel observations of a round for vision-based agents.
+
+Every asset is scaled down to the target size once, and each frame is composed directly into the pixels of a small
+surface through a view from 'pygame.surfarray', so the full-size display surface is never drawn or resized. No window is
+needed, which means this also works with 'SDL_VIDEODRIVER=dummy'. Apart from Pygame, this file also requires the 'NumPy'
+module.
+"""
+from Global import *
+import numpy
+import pygame
+import Pipe
+if TYPE_CHECKING:
+    import Session
+
+
+class PixelRenderer:
+    def __init__(self, size: Tuple[int, int] = (84, 84), resolution: Tuple[int, int] = GAME_RESOLUTION,
+                 grayscale: bool = True, angle_step: int = 5):
+        """Frames are 'size' pixels large and show the same area as a 'resolution' sized game screen. In grayscale mode
+        frames are 8-bit, otherwise they are RGB. Bird rotations are rounded to multiples of 'angle_step' degrees."""
+        self.size = size
+        self.resolution = resolution
+        self.grayscale = grayscale
+        self.angle_step = angle_step
+        self.scale_x = size[0] / resolution[0]
+        self.scale_y = size[1] / resolution[1]
+        if grayscale:
+            self.surface = pygame.Surface(size, depth=8)
+            self.surface.set_palette([(i, i, i) for i in range(256)])
+            self.view = pygame.surfarray.pixels2d(self.surface)
+        else:
+            self.surface = pygame.Surface(size, depth=32)
+            self.view = pygame.surfarray.pixels3d(self.surface)
+        # The view keeps the surface locked, so frames are only drawn into it with NumPy from now on.
+        self.frame = self.view.swapaxes(0, 1)
+        # region Scaled Assets
+        ground_image = load_image("./Images/Sprites/ground.png")
+        self.floor_y = round((resolution[1] - ground_image.get_height()) * self.scale_y)
+        self.background = numpy.zeros(self.view.shape, dtype=numpy.uint8)
+        background, _ = self.scale_image(load_image("./Images/Sprites/background.png"))
+        width, height = min(background.shape[0], size[0]), min(background.shape[1], self.floor_y)
+        self.background[:width, :height] = background[:width, :height]
+        ground_strip = pygame.Surface((ground_image.get_width() * (resolution[0] // ground_image.get_width() + 2),
+                                       ground_image.get_height()), flags=pygame.SRCALPHA)
+        for x in range(0, ground_strip.get_width(), ground_image.get_width()):
+            ground_strip.blit(ground_image, (x, 0))
+        self.ground, _ = self.scale_image(ground_strip, (round(ground_strip.get_width() * self.scale_x),
+                                                         size[1] - self.floor_y))
+        pipe_image = load_image("./Images/Sprites/pipe.png")
+        self.bottom_pipe = self.scale_image(pipe_image)
+        self.top_pipe = self.scale_image(pygame.transform.flip(pipe_image, False, True))
+        self.costumes = tuple(load_image("./Images/Sprites/{}".format(file))
+                              for file in ("flap down.png", "flap middle.png", "flap up.png"))
+        self.bird_cache: Dict[Tuple[int, int], Tuple[numpy.ndarray, numpy.ndarray]] = {}
+        # endregion
+
+    def scale_image(self, image: pygame.Surface,
+                    new_size: Optional[Tuple[int, int]] = None) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        """Returns the pixels of the image scaled to the frame size (or to 'new_size'), and a mask of its opaque
+        pixels."""
+        if new_size is None:
+            new_size = (max(1, round(image.get_width() * self.scale_x)),
+                        max(1, round(image.get_height() * self.scale_y)))
+        scaled = pygame.transform.smoothscale(image, new_size)
+        rgb = pygame.surfarray.array3d(scaled)
+        mask = pygame.surfarray.array_alpha(scaled) > 127
+        if self.grayscale:
+            pixels = (rgb[..., 0] * 0.299 + rgb[..., 1] * 0.587 + rgb[..., 2] * 0.114).round().astype(numpy.uint8)
+            return pixels, mask
+        return rgb, mask[..., numpy.newaxis]
+
+    def get_bird_image(self, costume_index: int, angle: float) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        key = (costume_index, round(angle / self.angle_step))
+        if key not in self.bird_cache:
+            rotated = pygame.transform.rotate(self.costumes[costume_index], key[1] * self.angle_step)
+            self.bird_cache[key] = self.scale_image(rotated.subsurface(rotated.get_bounding_rect()))
+        return self.bird_cache[key]
+
+    def paste(self, pixels: numpy.ndarray, mask: numpy.ndarray, x: int, y: int, bottom: Optional[int] = None) -> None:
+        """Copies the opaque pixels of an image onto the frame at (x, y), clipped to the frame and to 'bottom'."""
+        bottom = self.size[1] if bottom is None else bottom
+        left, top = max(x, 0), max(y, 0)
+        right, lower = min(x + pixels.shape[0], self.size[0]), min(y + pixels.shape[1], bottom)
+        if left >= right or top >= lower:
+            return None
+        numpy.copyto(self.view[left:right, top:lower], pixels[left - x:right - x, top - y:lower - y],
+                     where=mask[left - x:right - x, top - y:lower - y])
+
+    def render(self, session: "Session.GameSession") -> numpy.ndarray:
+        """Draws the current frame of the session and returns it as an array of shape (height, width) in grayscale mode,
+        or (height, width, 3) in RGB mode. The array is a view of the frame surface, so it is updated in place by the
+        next call; copy it if older frames have to be kept."""
+        view = self.view
+        view[...] = self.background
+        ground_x = round(-session.tiles_group.get_pos()[0] * self.scale_x)
+        view[:, self.floor_y:] = self.ground[ground_x:ground_x + self.size[0], :self.size[1] - self.floor_y]
+        top_pipe_height = self.top_pipe[0].shape[1]
+        for pipe_x, gap_y in session.pipe_group.iter_pipe_pos():
+            x = round(pipe_x * self.scale_x)
+            self.paste(*self.bottom_pipe, x, round(gap_y * self.scale_y), self.floor_y)
+            self.paste(*self.top_pipe, x, round((gap_y - Pipe.Pipe.gap_distance) * self.scale_y) - top_pipe_height,
+                       self.floor_y)
+        bird = session.get_bird()
+        self.paste(*self.get_bird_image(bird.costume_index, bird.angle), round(bird.x * self.scale_x),
+                   round(bird.y * self.scale_y))
+        return self.frame
+
+    def get_frame(self) -> numpy.ndarray:
+        return self.frame
+
+    def get_surface(self) -> pygame.Surface:
+        """Returns the frame surface. The surface stays locked by its pixel view, so it can be read from and filled,
+        but not blitted onto."""
+        return self.surface
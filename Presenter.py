@@ -0,0 +1,244 @@
+"""
+Presents the fixed-size display surface in a window of any size, letterboxed to keep its aspect ratio.
+
+The layout of the scaled surface and the letterbox bars is only calculated when the window changes, and the surface is
+scaled into a destination that is allocated once per layout: straight into the window if the pixel formats match, or
+else into a buffer that is blitted to the window. The bars are only repainted when their color changes.
+
+There are three scale modes. 'nearest' and 'smooth' fill as much of the window as possible with nearest neighbour or
+bilinear scaling, while 'integer' only scales by whole multiples, which keeps the pixels square and allows the regions
+that changed to be scaled on their own.
+
+The game world is drawn through 'draw_world', so that presenters can also draw it themselves, like the one in 'Native'.
+'RendererPresenter' uses the same layout, but leaves the scaling to SDL's renderer through a 'pygame.SCALED' window. SDL
+uses the GPU if there is one and its software renderer otherwise, and switches to full screen without creating a new
+window. It requires Pygame's '_sdl2' module.
+"""
+from Global import *
+import pygame
+import math
+import os
+if TYPE_CHECKING:
+    from pygame._sdl2 import video
+
+
+class Presenter:
+    scale_modes = ("nearest", "smooth", "integer")
+
+    def __init__(self, surface: pygame.Surface, scale_mode: Literal["nearest", "smooth", "integer"] = "nearest"):
+        """Presents 'surface', which keeps its size. 'set_mode' or 'set_window' has to be called before the first
+        frame."""
+        if scale_mode not in self.scale_modes:
+            raise ValueError("unknown scale mode '{}'".format(scale_mode))
+        self.surface = surface
+        self.scale_mode = scale_mode
+        self.window: Optional[pygame.Surface] = None
+        self.target_rect = surface.get_rect()  # The area of the window that the scaled surface covers.
+        self.bar_rects: List[pygame.Rect] = []
+        self.factor = 1  # The scale factor in integer mode, or 0 if the surface isn't scaled by a whole multiple.
+        self.target: Optional[pygame.Surface] = None  # The surface is scaled into this.
+        self.buffered = False  # True if the target is a buffer instead of part of the window.
+        self.bar_color: Optional[Tuple[float, ...]] = None
+        self.repaint = True
+
+    def set_window(self, window: pygame.Surface) -> None:
+        """Calculates the layout for a new or resized window, and repaints all of it in the next frame."""
+        self.window = window
+        self.calc_layout()
+
+    def set_mode(self, size: Tuple[int, int], full_screen: bool = False, resized: bool = False) -> pygame.Surface:
+        """Creates the window, or changes its size or whether it's full screen, and returns its surface. 'resized' means
+        that the user already resized the window to 'size'. The surface is converted to the pixel format of the window
+        when it's created, which allows it to be scaled straight into the window."""
+        if resized:
+            window = pygame.display.get_surface()  # Pygame resizes the display surface of resizable windows.
+        else:
+            window = pygame.display.set_mode(size, pygame.FULLSCREEN if full_screen else pygame.RESIZABLE)
+            if self.window is None:
+                self.surface = (self.surface.convert_alpha() if self.surface.get_flags() & pygame.SRCALPHA else
+                                self.surface.convert())
+        self.set_window(window)
+        return window
+
+    def set_scale_mode(self, scale_mode: Literal["nearest", "smooth", "integer"]) -> None:
+        if scale_mode not in self.scale_modes:
+            raise ValueError("unknown scale mode '{}'".format(scale_mode))
+        self.scale_mode = scale_mode
+        if self.window is not None:
+            self.calc_layout()
+
+    def invalidate(self) -> None:
+        """Repaints the whole window in the next frame, e.g. after its contents were lost."""
+        self.repaint = True
+
+    def calc_target_rect(self, window_size: Tuple[int, int]) -> None:
+        """Calculates the area of the window that the scaled surface covers, and the scale factor in integer mode."""
+        window_width, window_height = window_size
+        width, height = self.surface.get_size()
+        self.factor = min(window_width // width, window_height // height) if self.scale_mode == "integer" else 0
+        if self.factor:
+            size = (width * self.factor, height * self.factor)
+        elif width * window_height < window_width * height:  # The window is wider than the surface.
+            size = (round(width * window_height / height), window_height)
+        else:
+            size = (window_width, round(height * window_width / width))
+        self.target_rect = pygame.Rect((round(window_width / 2 - size[0] / 2), round(window_height / 2 - size[1] / 2)),
+                                       size)
+
+    def calc_bar_rects(self, window_size: Tuple[int, int]) -> None:
+        """Calculates the letterbox bars around the area that the scaled surface covers."""
+        window_width, window_height = window_size
+        left, top = self.target_rect.topleft
+        right, bottom = self.target_rect.bottomright
+        height = self.target_rect.height
+        self.bar_rects = [rect for rect in (pygame.Rect(0, 0, window_width, top),
+                                            pygame.Rect(0, bottom, window_width, window_height - bottom),
+                                            pygame.Rect(0, top, left, height),
+                                            pygame.Rect(right, top, window_width - right, height))
+                          if rect.width > 0 and rect.height > 0]
+
+    def calc_layout(self) -> None:
+        width, height = self.surface.get_size()
+        self.calc_target_rect(self.window.get_size())
+        self.calc_bar_rects(self.window.get_size())
+        size = self.target_rect.size
+        # Scaling into a surface requires it to have the same pixel format as the source.
+        self.buffered = (self.window.get_bitsize() != self.surface.get_bitsize() or
+                         self.window.get_masks() != self.surface.get_masks())
+        if size == (width, height):
+            self.target = None  # Regions are blitted to the window directly.
+        elif self.buffered:
+            self.target = pygame.Surface(size, 0, self.surface)
+        else:
+            self.target = self.window.subsurface(self.target_rect)
+        self.repaint = True
+
+    def get_size(self) -> Tuple[int, int]:
+        """Returns the size of the scaled surface in the window."""
+        return self.target_rect.size
+
+    def draw_world(self, blit_sequence: Iterable[tuple]) -> None:
+        """Draws the game world, given as blits in the format of 'Surface.blits', onto the surface."""
+        self.surface.blits(blit_sequence, doreturn=False)
+
+    def prescale(self, images: Iterable[pygame.Surface]) -> None:
+        """Prepares the images for 'draw_world' after the window changed. They are drawn as they are here."""
+
+    def present(self, regions: List[pygame.Rect], bar_color: Sequence[float] = BLACK) -> None:
+        """Draws the regions of the surface that changed to the window and updates them on the screen, along with the
+        letterbox bars if their color changed."""
+        update_rects = []
+        if self.repaint:
+            regions = [self.surface.get_rect()]
+        if self.repaint or tuple(bar_color) != self.bar_color:
+            self.bar_color = tuple(bar_color)
+            for rect in self.bar_rects:
+                self.window.fill(bar_color, rect)
+            update_rects.extend(self.bar_rects)
+        self.repaint = False
+        if regions:
+            update_rects.extend(self.draw_regions(regions))
+        if update_rects:
+            pygame.display.update(update_rects)
+
+    def draw_regions(self, regions: List[pygame.Rect]) -> List[pygame.Rect]:
+        """Scales the regions into the window and returns the areas of the window that they cover."""
+        x, y = self.target_rect.topleft
+        if self.target is None:
+            for region in regions:
+                self.window.blit(self.surface, region.move(x, y), region)
+            return [region.move(x, y) for region in regions]
+        if self.factor:
+            # Whole multiples map every pixel to the same block no matter where a region starts.
+            rects = []
+            for region in regions:
+                rect = pygame.Rect(region.x * self.factor, region.y * self.factor, region.width * self.factor,
+                                   region.height * self.factor)
+                pygame.transform.scale(self.surface.subsurface(region), rect.size, self.target.subsurface(rect))
+                rects.append(rect)
+        else:
+            if self.scale_mode == "smooth":
+                pygame.transform.smoothscale(self.surface, self.target_rect.size, self.target)
+            else:
+                pygame.transform.scale(self.surface, self.target_rect.size, self.target)
+            scale_x = self.target_rect.width / self.surface.get_width()
+            scale_y = self.target_rect.height / self.surface.get_height()
+            # Widening the regions covers every pixel that a changed pixel is blended or rounded into.
+            margin = math.ceil(max(scale_x, scale_y)) + 1
+            rects = []
+            for region in regions:
+                left = math.floor(region.left * scale_x) - margin
+                top = math.floor(region.top * scale_y) - margin
+                rect = pygame.Rect(left, top, math.ceil(region.right * scale_x) + margin - left,
+                                   math.ceil(region.bottom * scale_y) + margin - top)
+                rects.append(rect.clip(self.target.get_rect()))
+        if self.buffered:
+            for rect in rects:
+                self.window.blit(self.target, rect.move(x, y), rect)
+        return [rect.move(x, y) for rect in rects]
+
+
+class RendererPresenter(Presenter):
+    def __init__(self, surface: pygame.Surface, scale_mode: Literal["nearest", "smooth", "integer"] = "nearest"):
+        """Presents 'surface' through SDL's renderer. 'set_mode' has to be called before the first frame, and the
+        filtering of the 'smooth' scale mode only takes effect if it's chosen before then."""
+        super().__init__(surface, scale_mode)
+        self.sdl_window: Optional["video.Window"] = None
+        self.renderer: Optional["video.Renderer"] = None
+        self.window_size = surface.get_size()
+
+    @staticmethod
+    def is_available() -> bool:
+        try:
+            from pygame._sdl2 import video
+        except ImportError:
+            return False
+        return True
+
+    def set_mode(self, size: Tuple[int, int], full_screen: bool = False, resized: bool = False) -> pygame.Surface:
+        """Creates the window, or changes its size or whether it's full screen, and returns its surface. The surface of
+        a 'pygame.SCALED' window always has the size of the presented surface, and Pygame streams it into a texture
+        that SDL scales to the window. The window is only created once, and full screen is the desktop's resolution, so
+        switching to it doesn't change the display mode."""
+        if self.sdl_window is None:
+            from pygame._sdl2 import video
+            # The filtering is picked when Pygame creates the texture.
+            os.environ["SDL_RENDER_SCALE_QUALITY"] = "linear" if self.scale_mode == "smooth" else "nearest"
+            self.window = pygame.display.set_mode(self.surface.get_size(), pygame.RESIZABLE | pygame.SCALED)
+            self.surface = self.surface.convert()
+            self.sdl_window = video.Window.from_display_module()
+            self.renderer = video.Renderer.from_window(self.sdl_window)
+        if full_screen:
+            self.sdl_window.set_fullscreen(desktop=True)
+        elif not resized:
+            self.sdl_window.set_windowed()
+            self.sdl_window.size = size
+        self.window_size = tuple(size)
+        self.calc_layout()
+        return self.window
+
+    def calc_layout(self) -> None:
+        self.calc_target_rect(self.window_size)
+        self.repaint = True
+
+    def present(self, regions: List[pygame.Rect], bar_color: Sequence[float] = BLACK) -> None:
+        """Copies the regions of the surface that changed to the window, and lets SDL scale the window's surface into
+        the letterbox and clear the bars to 'bar_color'. Nothing is presented if neither of them changed."""
+        if self.repaint:
+            regions = [self.surface.get_rect()]
+        elif not regions and tuple(bar_color) == self.bar_color:
+            return None
+        self.bar_color = tuple(bar_color)
+        self.repaint = False
+        for region in regions:
+            self.window.blit(self.surface, region, region)
+        # Pygame's own layout only scales by whole multiples in a window, so the letterbox is set as the viewport
+        # instead. SDL clears the whole window, so the bars get the draw color.
+        self.renderer.logical_size = (0, 0)
+        self.renderer.scale = (1, 1)
+        self.renderer.set_viewport(self.target_rect)
+        self.renderer.draw_color = pygame.Color(*(round(value) for value in bar_color))
+        pygame.display.update()
+        # Pygame maps mouse positions and the text input rectangle through the viewport, while the game expects them in
+        # window coordinates.
+        self.renderer.set_viewport(None)
@@ -4,14 +4,14 @@ import random
 
 
 class Rainbow:
-    def __init__(self):
+    def __init__(self, clock: Optional[Time.BaseClock] = None):
         self.destination_rgb = tuple(random.randint(0, 255) for _ in range(3))
         self.current_rgb = list(self.destination_rgb)
         self.divider_constant = 1
         self.size_diff = []
         self.steps = None
         self.delay = 0.1
-        self.tick_timer = Time.Time()
+        self.tick_timer = Time.Time(clock)
 
     def init_rainbow(self) -> None:
         self.tick_timer.reset_timer()
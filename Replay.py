@@ -0,0 +1,205 @@
+"""
+Records rounds as compact replays and plays them back, either in a window or headless as fast as the CPU allows.
+
+A replay stores the seed of the round's random generator, the tick rate of its fixed timestep, and the tick index of
+every jump, pause and unpause. Since rounds are deterministic for a given seed and sequence of ticks, this is enough to
+reproduce a round exactly. All numbers are written as unsigned LEB128 varints, and event ticks as the difference from
+the previous event, so most events take a single byte.
+
+Usage: python Replay.py <replay file> [--headless] [--speed <multiplier>]
+"""
+from Global import *
+import argparse
+import Session
+import pygame
+import time
+import sys
+import os
+
+
+def write_varint(buffer: bytearray, value: int) -> None:
+    if value < 0:
+        raise ValueError("varints can't be negative")
+    while value > 0x7F:
+        buffer.append(value & 0x7F | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def read_varint(data: bytes, offset: int) -> Tuple[int, int]:
+    """Returns the varint at 'offset', and the offset of the byte after it."""
+    value = 0
+    shift = 0
+    while True:
+        if offset >= len(data):
+            raise ValueError("the replay data ends in the middle of a number")
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+class Replay:
+    magic = b"FBRP"
+    # Increased whenever a change to the game changes how rounds play out, since older replays can't be reproduced. The
+    # seeded pipe courses and the cached bird rotations both did.
+    version = 3
+    event_names = ("jump", "pause", "unpause")
+
+    def __init__(self, seed: int, tick_rate: int = TICK_RATE, resolution: Tuple[int, int] = GAME_RESOLUTION):
+        self.seed = seed
+        self.tick_rate = tick_rate
+        self.resolution = resolution
+        self.events: List[Tuple[int, int]] = []  # The tick index and event type of every input, in order.
+        self.tick_count = 0
+        self.score = 0
+
+    def record(self, tick: int, event: Literal["jump", "pause", "unpause"]) -> None:
+        self.events.append((tick, self.event_names.index(event)))
+
+    def finish(self, tick_count: int, score: int) -> None:
+        """Stores the length of the round in ticks and the final score, which playback can be checked against."""
+        self.tick_count = tick_count
+        self.score = score
+
+    def encode(self) -> bytes:
+        data = bytearray(self.magic)
+        data.append(self.version)
+        for value in (self.seed, self.tick_rate, *self.resolution, self.tick_count, self.score, len(self.events)):
+            write_varint(data, value)
+        previous_tick = 0
+        for tick, event in self.events:
+            # The event type is stored in the lowest two bits of the tick difference.
+            write_varint(data, (tick - previous_tick) << 2 | event)
+            previous_tick = tick
+        return bytes(data)
+
+    @classmethod
+    def read_version(cls, data: bytes) -> Optional[int]:
+        """Returns the version of the game that the replay was recorded with, or None if the data isn't a replay."""
+        if data[:len(cls.magic)] != cls.magic or len(data) <= len(cls.magic):
+            return None
+        return data[len(cls.magic)]
+
+    @classmethod
+    def decode(cls, data: bytes) -> "Replay":
+        """Raises ValueError if the data isn't a replay, or is from a different version of the game."""
+        if data[:len(cls.magic)] != cls.magic or len(data) <= len(cls.magic):
+            raise ValueError("the data isn't a replay")
+        if data[len(cls.magic)] > cls.version:
+            raise ValueError("the replay is from a newer version of the game")
+        if data[len(cls.magic)] < cls.version:
+            raise ValueError("the replay is from an older version of the game")
+        offset = len(cls.magic) + 1
+        values = []
+        for _ in range(7):
+            value, offset = read_varint(data, offset)
+            values.append(value)
+        seed, tick_rate, width, height, tick_count, score, event_count = values
+        if tick_rate <= 0:
+            raise ValueError("the replay has an invalid tick rate")
+        if width <= 0 or height <= 0:
+            raise ValueError("the replay has an invalid resolution")
+        replay = cls(seed, tick_rate, (width, height))
+        replay.finish(tick_count, score)
+        tick = 0
+        for _ in range(event_count):
+            value, offset = read_varint(data, offset)
+            tick += value >> 2
+            if value & 3 >= len(cls.event_names):
+                raise ValueError("the replay contains an unknown event")
+            replay.events.append((tick, value & 3))
+        return replay
+
+    def get_jump_ticks(self) -> List[int]:
+        return [tick for tick, event in self.events if event == 0]
+
+    def get_tick_length(self) -> float:
+        return 1 / self.tick_rate
+
+
+class Player:
+    def __init__(self, replay: Replay):
+        """Steps a new session through the replayed round one tick at a time. Pauses don't affect the simulation, so
+        they are skipped."""
+        self.replay = replay
+        self.session = Session.GameSession(replay.resolution, replay.seed)
+        self.tick_length = replay.get_tick_length()
+        self.jump_ticks = replay.get_jump_ticks()
+        self.index = 0  # The index of the next jump.
+
+    def is_done(self) -> bool:
+        return self.session.step_count >= self.replay.tick_count or self.session.is_over()
+
+    def tick(self) -> None:
+        jump = False
+        while self.index < len(self.jump_ticks) and self.jump_ticks[self.index] <= self.session.step_count:
+            jump = True
+            self.index += 1
+        self.session.step(self.tick_length, jump)
+
+
+def play_headless(replay: Replay) -> "Session.GameSession":
+    """Simulates the replayed round without a window, as fast as possible, and returns the session at the end of it."""
+    player = Player(replay)
+    while not player.is_done():
+        player.tick()
+    return player.session
+
+
+def play_window(replay: Replay, speed: float = 1) -> "Session.GameSession":
+    """Plays the replayed round back in a window, 'speed' times faster than real time. The window can be closed at any
+    time to stop early. Returns the session at the end of the playback."""
+    display = pygame.display.set_mode(replay.resolution)
+    pygame.display.set_caption("Flappy Bird - Replay")
+    background = load_image("./Images/Sprites/background.png")
+    player = Player(replay)
+    session = player.session
+    clock = pygame.time.Clock()
+    accumulator = 0
+    while not player.is_done():
+        accumulator += min(clock.tick(90) / 1000, 0.25) * speed
+        if any(event.type == pygame.QUIT for event in pygame.event.get()):
+            break
+        while accumulator >= player.tick_length and not player.is_done():
+            player.tick()
+            accumulator -= player.tick_length
+        display.fill(BLACK)
+        display.blit(background, (0, 0))
+        session.tiles_group.draw(display)
+        session.pipe_group.draw(display)
+        session.bird.draw(display)
+        score_obj = session.pipe_group.get_score_obj()
+        score_obj.draw(display, (replay.resolution[0] / 2 - score_obj.calc_size()[0] / 2, 20))
+        pygame.display.update()
+    return session
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Plays back a Flappy Bird replay.")
+    parser.add_argument("path", help="the replay file to play")
+    parser.add_argument("--headless", action="store_true", help="simulate the round as fast as possible without a "
+                                                                "window")
+    parser.add_argument("--speed", type=float, default=1, help="the playback speed multiplier in a window")
+    args = parser.parse_args()
+    try:
+        with open(args.path, "rb") as file:
+            replay = Replay.decode(file.read())
+    except (OSError, ValueError) as error:
+        print("Failed to read the replay: {}".format(error), file=sys.stderr)
+        sys.exit(1)
+    if args.headless:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    start = time.perf_counter()
+    session = play_headless(replay) if args.headless else play_window(replay, args.speed)
+    elapsed = time.perf_counter() - start
+    print("Played {} of {} ticks in {:.3f} seconds. Score: {} (recorded: {})"
+          .format(session.step_count, replay.tick_count, elapsed, session.get_score(), replay.score))
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
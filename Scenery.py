@@ -0,0 +1,48 @@
+"""
+Caches the layers behind everything else on the screen: the background and the ground.
+
+Neither of them ever looks different, only the ground's x position changes. The background is composed onto black once,
+in the pixel format of the display, so it's drawn with a single opaque blit instead of a fill and a blend. The ground is a
+strip of whole tiles that is one tile wider than the screen, so it repeats every tile, and the ground at any position is
+drawn as one blit of the part of the strip that the position wraps around to.
+"""
+from Global import *
+import pygame
+import math
+
+
+class Scenery:
+    def __init__(self, resolution: Tuple[int, int], surface: pygame.Surface):
+        """Caches the layers in the pixel format of 'surface', which should be the surface they are drawn to."""
+        self.resolution = resolution
+        background = load_image("./Images/Sprites/background.png")
+        self.backdrop = pygame.Surface(resolution, 0, surface)
+        self.backdrop.fill(BLACK)
+        self.backdrop.blit(background, (0, 0))
+        tile = load_image("./Images/Sprites/ground.png")
+        self.tile_width, tile_height = tile.get_size()
+        self.strip = pygame.Surface((self.tile_width * (math.ceil(resolution[0] / self.tile_width) + 1), tile_height), 0,
+                                    surface)
+        for x in range(0, self.strip.get_width(), self.tile_width):
+            self.strip.blit(tile, (x, 0))
+        self.ground_rect = pygame.Rect(0, resolution[1] - tile_height, resolution[0], tile_height)
+
+    def get_ground_offset(self, ground_x: float) -> int:
+        """Returns the x position in the strip that the left edge of the screen shows for a ground at 'ground_x'. Like
+        sprites, the ground is drawn at its position rounded towards zero."""
+        return -int(ground_x) % self.tile_width
+
+    def get_ground_rect(self) -> pygame.Rect:
+        return self.ground_rect
+
+    def get_images(self) -> Tuple[pygame.Surface, pygame.Surface]:
+        return self.backdrop, self.strip
+
+    def get_blits(self, ground_x: float) -> List[tuple]:
+        """Returns the blits that draw the layers with the ground at 'ground_x', in the format of 'Surface.blits'."""
+        return [(self.backdrop, (0, 0)),
+                (self.strip, self.ground_rect.topleft,
+                 pygame.Rect(self.get_ground_offset(ground_x), 0, self.ground_rect.width, self.ground_rect.height))]
+
+    def draw(self, surface: pygame.Surface, ground_x: float) -> None:
+        surface.blits(self.get_blits(ground_x), doreturn=False)
@@ -0,0 +1,201 @@
+from Global import *
+import Replay
+import Ground
+import Bird
+import Pipe
+import Time
+import random
+import struct
+if TYPE_CHECKING:
+    import Mouse
+
+
+class GameSession:
+    state_names = ("menu", "waiting", "started", "dying", "over")
+    # State index, step count, clock time, the flags of the bird manager, then the bird, ground and pipe group states,
+    # followed by the seed and position of the course.
+    snapshot_header = struct.Struct("<BId??" + Bird.Bird.state_format + Ground.GroundGroup.state_format +
+                                    Pipe.PipeGroup.state_format + Pipe.Course.state_format)
+    snapshot_pipe = struct.Struct("<" + Pipe.PipeGroup.pipe_state_format)
+    saved_round_header = struct.Struct("<I")  # The length of the snapshot in a round saved by 'save_round'.
+    bird_fields = len(struct.unpack("<" + Bird.Bird.state_format, bytes(struct.calcsize("<" + Bird.Bird.state_format))))
+    ground_fields = len(struct.unpack("<" + Ground.GroundGroup.state_format,
+                                      bytes(struct.calcsize("<" + Ground.GroundGroup.state_format))))
+
+    def __init__(self,
+                 resolution: Tuple[int, int] = GAME_RESOLUTION,
+                 seed: Optional[int] = None,
+                 font_height: int = 70,
+                 kerning: int = 5,
+                 z_index: int = 5,
+                 state_data: Optional[Callable[..., Optional[str]]] = None,
+                 dying_binding: Optional[Callable[[], None]] = None,
+                 game_over_binding: Optional[Callable[[], None]] = None,
+                 precompute: int = 0):
+        """Runs a single round of the game without a window. Time only passes when 'step' is called, so rounds can be
+        simulated as fast as the CPU allows. The bird, pipes and ground are the same objects used by the game, which
+        keeps the simulation identical to the real thing.
+
+        When embedded in the game, 'state_data' can be given to share the game state of the caller, and the bindings
+        are called when the bird dies and when it has fallen out of the screen. A random seed is picked if 'seed' is
+        None, so that every round can be replayed. If 'precompute' is positive, the gaps of the pipes are generated that
+        many at a time in advance (see 'Pipe.Course')."""
+        self.resolution = resolution
+        self.seed = random.getrandbits(32) if seed is None else seed
+        self.clock = Time.ManualClock()
+        self.game_state: Literal["menu", "waiting", "started", "dying", "over"] = "menu"
+        self.state_data = self.access_game_state if state_data is None else state_data
+        self.dying_binding = dying_binding
+        self.game_over_binding = game_over_binding
+        self.tiles_group = Ground.GroundGroup(self.resolution, self.clock)
+        self.course = Pipe.Course(Pipe.Course.calc_gap_range(self.resolution, self.tiles_group.get_size()), self.seed,
+                                  precompute)
+        self.pipe_group = Pipe.PipeGroup(self.resolution, self.tiles_group.get_size(), font_height, kerning, self.clock,
+                                         self.course)
+        self.bird = Bird.BirdManager(self.resolution, z_index, self.clock)
+        self.bird.spawn_bird(self.state_data, self.tiles_group)
+        self.bird.bird_object.wiggle_tick()  # Start at the same position the first frame of the round would show.
+        self.step_count = 0
+        self.replay: Optional["Replay.Replay"] = None
+
+    def access_game_state(self, new_state: Optional[str] = None) -> Optional[str]:
+        if new_state is None:
+            return self.game_state
+        else:
+            self.game_state = new_state
+
+    def process_user_events(self, mouse_object: Optional["Mouse.Cursor"], mouse_initiated: bool) -> None:
+        if self.state_data() in ("waiting", "started"):
+            if self.bird.process_user_events(self.state_data, self.pipe_group, mouse_object, mouse_initiated):
+                self.record_input("jump")
+
+    def jump(self) -> None:
+        self.process_user_events(None, False)
+
+    def step(self, delta_time: float, jump: bool = False) -> str:
+        """Advances the round by 'delta_time' seconds and returns the game state afterwards. If 'jump' is True, the bird
+        jumps before the time step is simulated."""
+        if self.state_data() == "over":
+            return "over"
+        if jump:
+            self.jump()
+        ended = self.has_ended()
+        self.clock.advance(delta_time)
+        self.bird.update(self.tiles_group, self.pipe_group, self.state_data, self.dying_callback,
+                         self.game_over_callback)
+        self.step_count += 1
+        if self.replay is not None and not ended and self.has_ended():
+            # The replay ends here even if the caller keeps stepping the round, e.g. during a transition, so that
+            # playback, which stops when the round is over, consumes exactly its ticks.
+            self.replay.finish(self.step_count, self.get_score())
+        return self.state_data()
+
+    def start_recording(self, tick_rate: int) -> None:
+        """Starts recording the inputs of the round into a replay. The round must be stepped in ticks of exactly
+        '1 / tick_rate' seconds for the replay to be accurate."""
+        self.replay = Replay.Replay(self.seed, tick_rate, self.resolution)
+
+    def record_input(self, event: Literal["jump", "pause", "unpause"]) -> None:
+        if self.replay is not None:
+            self.replay.record(self.step_count, event)
+
+    def stop_recording(self) -> Optional["Replay.Replay"]:
+        """Stops recording and returns the finished replay, or None if the round wasn't being recorded."""
+        replay = self.replay
+        if replay is not None:
+            if not self.has_ended():
+                replay.finish(self.step_count, self.get_score())  # Ended rounds were finished by 'step'.
+            self.replay = None
+        return replay
+
+    def snapshot(self) -> bytes:
+        """Returns the complete state of the round as a compact byte string, which can be passed to 'restore' to resume
+        (or branch off from) this exact point. Snapshots are small enough to take every tick."""
+        header, pipe_states = self.pipe_group.get_state()
+        data = bytearray(self.snapshot_header.size + self.snapshot_pipe.size * len(pipe_states))
+        self.snapshot_header.pack_into(data, 0, self.state_names.index(self.state_data()), self.step_count,
+                                       self.clock.now(), *self.bird.get_state(), *self.get_bird().get_state(),
+                                       *self.tiles_group.get_state(), *header, *self.course.get_state())
+        offset = self.snapshot_header.size
+        for state in pipe_states:
+            self.snapshot_pipe.pack_into(data, offset, *state)
+            offset += self.snapshot_pipe.size
+        return bytes(data)
+
+    def restore(self, data: bytes) -> None:
+        """Restores a state returned by 'snapshot'. The existing game objects are reused, so restoring is cheap enough
+        to search through many possible futures of a round. The inputs that led to the snapshot are unknown, so this
+        also stops recording without keeping the replay. Raises 'struct.error' if the data is malformed."""
+        header = self.snapshot_header.unpack_from(data)
+        pipe_states = list(self.snapshot_pipe.iter_unpack(memoryview(data)[self.snapshot_header.size:]))
+        bird_end = 5 + self.bird_fields
+        ground_end = bird_end + self.ground_fields
+        if header[ground_end + 3] != len(pipe_states):
+            raise struct.error("the number of pipes doesn't match the snapshot header")
+        self.state_data(self.state_names[header[0]])
+        self.step_count = header[1]
+        self.clock.current_time = header[2]
+        self.bird.set_state(*header[3:5])
+        self.get_bird().set_state(*header[5:bird_end])
+        self.tiles_group.set_state(*header[bird_end:ground_end])
+        self.pipe_group.set_state(*header[ground_end:ground_end + 3], pipe_states)
+        self.course.set_state(*header[ground_end + 4:])
+        self.seed = self.course.seed
+        self.replay = None
+
+    def save_round(self) -> bytes:
+        """Returns a snapshot of the round followed by the replay recorded so far, if any. 'load_round' resumes both, so
+        that the replay of a round that is resumed later covers the whole round and can still be verified."""
+        snapshot = self.snapshot()
+        data = bytearray(self.saved_round_header.pack(len(snapshot)))
+        data += snapshot
+        if self.replay is not None:
+            if not self.has_ended():
+                self.replay.finish(self.step_count, self.get_score())
+            data += self.replay.encode()
+        return bytes(data)
+
+    def load_round(self, data: bytes) -> None:
+        """Restores a round saved by 'save_round', and continues recording its replay if it was being recorded. Raises
+        'struct.error' or ValueError if the data is malformed."""
+        size = self.saved_round_header.unpack_from(data)[0]
+        end = self.saved_round_header.size + size
+        if len(data) < end:
+            raise struct.error("the saved round is shorter than its snapshot")
+        self.restore(data[self.saved_round_header.size:end])
+        if len(data) > end:
+            replay = Replay.Replay.decode(data[end:])
+            if replay.resolution != self.resolution:
+                raise ValueError("the replay of the saved round has a different resolution")
+            self.seed = replay.seed
+            self.replay = replay
+
+    def dying_callback(self) -> None:
+        if self.dying_binding is not None:
+            self.dying_binding()
+
+    def game_over_callback(self) -> None:
+        if self.game_over_binding is None:
+            self.state_data("over")
+        else:
+            self.game_over_binding()
+
+    def is_alive(self) -> bool:
+        return self.state_data() in ("waiting", "started")
+
+    def is_over(self) -> bool:
+        return self.state_data() == "over"
+
+    def has_ended(self) -> bool:
+        """Returns True once the bird has fallen out of the screen, even if the game state of the caller is still
+        'dying'."""
+        return not self.bird.spawned
+
+    def get_score(self) -> int:
+        return self.pipe_group.get_score_obj().get_score()
+
+    def get_time(self) -> float:
+        return self.clock.now()
+
+    def get_bird(self) -> Bird.Bird:
+        return self.bird.bird_object
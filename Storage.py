@@ -3,7 +3,9 @@ from functools import partial
 from typing import *
 import threading
 import platform
+import base64
 import queue
+import time
 import enum
 import csv
 import os
@@ -111,11 +113,14 @@ class HelpFile:
 
 
 class ScoreDB:
+    # The columns of the scoreboard. The replay of each score is stored as Base64 text. Scoreboards from older versions
+    # don't have this column.
+    fields = ("player-name", "score", "replay")
+
     def __init__(self, kill_achievement_thread: Callable[[], None]):
         self.dir_path = get_platform_data_path("global", kill_achievement_thread)
         self.file_path = os.path.join(self.dir_path, "scoreboard.csv")
         self.encoding = "utf-8"
-        self.fields = ("player-name", "score")
         self.data_queue = queue.Queue()
         self.io_thread: Optional[threading.Thread] = None
 
@@ -167,11 +172,11 @@ class ScoreDB:
         else:
             self.data_queue.put((status_codes["success"], csv_data))
 
-    def start_write_score(self, player_name: str, score: int) -> None:
-        self.io_thread = threading.Thread(target=self.write_score, args=(player_name, score))
+    def start_write_score(self, player_name: str, score: int, replay: Optional[bytes] = None) -> None:
+        self.io_thread = threading.Thread(target=self.write_score, args=(player_name, score, replay))
         self.io_thread.start()
 
-    def write_score(self, player_name: str, score: int) -> None:
+    def write_score(self, player_name: str, score: int, replay: Optional[bytes] = None) -> None:
         """Starts the write operation to insert the data given to the beginning of the DB."""
         if not os.path.isfile(self.file_path) and not self.write_config_file():
             return None
@@ -179,9 +184,11 @@ class ScoreDB:
             with open(self.file_path, "r", encoding=self.encoding, newline="") as file:
                 reader = csv.DictReader(file, self.fields)
                 csv_data = list(reader)
-            if not csv_data or csv_data[0] != {self.fields[0]: self.fields[0], self.fields[1]: self.fields[1]}:
+            if not csv_data or any(csv_data[0][field] != field for field in self.fields[:2]):
                 return None  # Malformed data.
-            csv_data.insert(1, {self.fields[0]: player_name, self.fields[1]: score})
+            csv_data[0] = {field: field for field in self.fields}  # Adds the replay column to older scoreboards.
+            csv_data.insert(1, {self.fields[0]: player_name, self.fields[1]: score,
+                                self.fields[2]: "" if replay is None else base64.b64encode(replay).decode("ascii")})
             with open(self.file_path, "w", encoding=self.encoding, newline="") as file:
                 writer = csv.DictWriter(file, self.fields)
                 writer.writerows(csv_data)
@@ -266,3 +273,57 @@ class AchievementDB:
             return None
         stored_data[index] = True
         self.write_data(stored_data)
+
+
+class RoundSnapshot:
+    def __init__(self, kill_achievement_thread: Callable[[], None]):
+        """Keeps a snapshot of the paused round on the hard disk, so that it can be resumed after the game is closed.
+        Files are small, so they are read and written synchronously."""
+        self.parent_dir = get_platform_data_path("user", kill_achievement_thread)
+        self.file_path = os.path.join(self.parent_dir, "paused_round.bin")
+
+    def save(self, data: bytes) -> bool:
+        try:
+            if not os.path.isdir(self.parent_dir):
+                os.mkdir(self.parent_dir)
+            with open(self.file_path, "wb") as file:
+                file.write(data)
+        except OSError:
+            return False
+        else:
+            return True
+
+    def load(self) -> Optional[bytes]:
+        if not os.path.isfile(self.file_path):
+            return None
+        try:
+            with open(self.file_path, "rb") as file:
+                return file.read()
+        except OSError:
+            return None
+
+    def delete(self) -> None:
+        try:
+            os.remove(self.file_path)
+        except OSError:
+            return None
+
+
+class ReplayStore:
+    def __init__(self, kill_achievement_thread: Callable[[], None]):
+        """Saves the replays of finished rounds to the hard disk. Replays are small, so they are written
+        synchronously."""
+        self.dir_path = os.path.join(get_platform_data_path("user", kill_achievement_thread), "replays")
+
+    def save(self, data: bytes, seed: int) -> Optional[str]:
+        """Writes the replay to a new file named after the current time and the seed of the round. Returns the path of
+        the file, or None if an OS error occurred."""
+        file_path = os.path.join(self.dir_path, "{}_{}.replay".format(time.strftime("%Y-%m-%d_%H-%M-%S"), seed))
+        try:
+            os.makedirs(self.dir_path, exist_ok=True)
+            with open(file_path, "wb") as file:
+                file.write(data)
+        except OSError:
+            return None
+        else:
+            return file_path
@@ -0,0 +1,88 @@
+"""
+This file is only for testing that the native presentation in 'Native' shows the same screen as the surface presentation
+in 'Presenter' while dialogs, transitions and other translucent layers are drawn over the game world. It can be safely
+deleted because it is not imported by the rest of the project files. Apart from Pygame, it requires the 'NumPy' module.
+"""
+import os.path
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(os.path.normpath(__file__)), "..")))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # The windows are only read back, so they don't have to be shown.
+from Global import *
+import Presenter
+import Scenery
+import Widgets
+import Native
+import pygame
+
+
+def draw_layers(surface: pygame.Surface, layers: List[Tuple[str, int]]) -> None:
+    """Draws translucent layers over the screen, like the dialogs, transitions and the loading screen do."""
+    width, height = surface.get_size()
+    for kind, alpha in layers:
+        if kind == "dialog":
+            overlay = Widgets.WindowOverlay(width, height, 255, 100)
+            overlay.update(100 * alpha / 255)
+            surface.blit(overlay.image, overlay.rect)
+            window = pygame.Surface((width // 2, height // 3))
+            window.fill((205, 205, 205))
+            surface.blit(window, (width // 4, height // 3))
+        elif kind == "transition":
+            transition = Widgets.SceneTransition(width, height, 400)
+            transition.image.set_alpha(alpha)
+            surface.blit(transition.image, transition.rect)
+        elif kind == "loading":
+            overlay = Widgets.BaseOverlay(width, height)
+            overlay.image.set_alpha(alpha)
+            surface.blit(overlay.image, overlay.rect)
+        elif kind == "white":
+            square = pygame.Surface((60, 60))
+            square.fill(WHITE)
+            square.set_alpha(alpha)
+            surface.blit(square, (20, 100))
+
+
+def present(presenter_class: type, window_size: Tuple[int, int], layers: List[Tuple[str, int]]) -> pygame.Surface:
+    """Presents a frame of the world with the layers over it in a new window, and returns a copy of the window."""
+    presenter = presenter_class(pygame.Surface(GAME_RESOLUTION), "nearest")
+    presenter.set_mode(window_size)
+    scenery = Scenery.Scenery(GAME_RESOLUTION, presenter.surface)
+    # A sprite with an alpha channel, whose transparent pixels have to show the scenery behind them.
+    bird = load_image("./Images/Sprites/flap middle.png")
+    presenter.prescale(scenery.get_images() + (bird,))
+    presenter.draw_world(scenery.get_blits(-37) + [(bird, (100, 200))])
+    draw_layers(presenter.surface, layers)
+    presenter.present([presenter.surface.get_rect()])
+    window = pygame.display.get_surface().copy()
+    pygame.display.quit()
+    return window
+
+
+def test(scale: int, layers: List[Tuple[str, int]]) -> int:
+    """Compares the windows of both presentations, and returns 1 if they differ, else 0."""
+    window_size = (GAME_RESOLUTION[0] * scale, GAME_RESOLUTION[1] * scale)
+    expected = present(Presenter.Presenter, window_size, layers)
+    result = present(Native.NativePresenter, window_size, layers)
+    if pygame.image.tobytes(expected, "RGB") == pygame.image.tobytes(result, "RGB"):
+        return 0
+    for y in range(window_size[1]):
+        for x in range(window_size[0]):
+            if expected.get_at((x, y)) != result.get_at((x, y)):
+                print("{}x, {}: pixel {} is {}, the surface presentation shows {}".format(
+                    scale, layers, (x, y), tuple(result.get_at((x, y))), tuple(expected.get_at((x, y)))))
+                return 1
+    return 0
+
+
+if __name__ == "__main__":
+    pygame.init()
+    failed = 0
+    # The world is only drawn the same way by both when it isn't scaled, but a layer over the whole screen is always
+    # mapped from the screen at the fixed resolution.
+    for layers in ([], [("white", 128)], [("loading", 128), ("white", 128)]):
+        failed += test(1, layers)
+    for scale in (1, 2):
+        for layers in ([("dialog", 100)], [("dialog", 100), ("white", 128)], [("transition", 128)],
+                       [("transition", 255)], [("loading", 64), ("transition", 1)]):
+            failed += test(scale, layers)
+    print("{} checks failed".format(failed))
+    pygame.quit()
@@ -0,0 +1,50 @@
+"""
+This file is only for testing the closed-form trajectory prediction in 'Physics.Trajectory' against stepping the motion
+tick by tick. It can be safely deleted because it is not imported by the rest of the project files.
+"""
+import os.path
+import random
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(os.path.normpath(__file__)), "..")))
+import Physics
+GRAVITY = 950
+TERMINAL_VELOCITY = 700
+TICK_LENGTH = 1 / 120
+
+
+def step(y: float, speed: float, tick_count: int) -> list:
+    """Returns the y position at every tick from 0 to 'tick_count', stepped like 'Bird.calculate_movement'."""
+    positions = [y]
+    for _ in range(tick_count):
+        speed = min(speed + GRAVITY * TICK_LENGTH, TERMINAL_VELOCITY)
+        y += speed * TICK_LENGTH
+        positions.append(y)
+    return positions
+
+
+def test(y: float, speed: float, tick_count: int = 240) -> int:
+    """Checks the positions and the apex of one trajectory, and returns the number of failed checks."""
+    trajectory = Physics.Trajectory(y, speed, GRAVITY, TERMINAL_VELOCITY, TICK_LENGTH)
+    positions = step(y, speed, tick_count)
+    failures = 0
+    for tick, stepped_y in enumerate(positions):
+        if abs(trajectory.get_y(tick * TICK_LENGTH) - stepped_y) > 1e-6:
+            print("y={}, speed={}: position at tick {} is {}, stepping gives {}".format(
+                y, speed, tick, trajectory.get_y(tick * TICK_LENGTH), stepped_y))
+            failures += 1
+            break
+    apex_time, apex_y = trajectory.get_apex()
+    apex_tick = min(range(len(positions)), key=lambda tick: positions[tick])  # The earliest of the highest ticks.
+    if round(apex_time / TICK_LENGTH) != apex_tick and abs(apex_y - positions[apex_tick]) > 1e-6:
+        print("y={}, speed={}: apex at tick {} (y {:.3f}), stepping gives tick {} (y {:.3f})".format(
+            y, speed, round(apex_time / TICK_LENGTH), apex_y, apex_tick, positions[apex_tick]))
+        failures += 1
+    return failures
+
+
+if __name__ == "__main__":
+    failed = test(100, -100)
+    generator = random.Random(0)
+    for _ in range(2000):
+        failed += test(generator.uniform(0, 700), generator.uniform(-360, TERMINAL_VELOCITY))
+    print("{} checks failed".format(failed))
@@ -1,23 +1,111 @@
+from typing import *
 import pygame.time
+import abc
 
 
-class Time:
+class BaseClock(abc.ABC):
+    @abc.abstractmethod
+    def now(self) -> float:
+        """Returns the current time of this clock in seconds."""
+
+
+class FrameClock(BaseClock):
     def __init__(self):
+        """The root of the clock tree. The real time is only read when 'tick' is called once per frame, so every object
+        sees the same time for the whole frame. Until the first tick, the real time is read on every call instead."""
+        self.current_time: Optional[float] = None
+
+    def tick(self) -> None:
+        self.current_time = pygame.time.get_ticks() / 1000
+
+    def now(self) -> float:
+        if self.current_time is None:
+            return pygame.time.get_ticks() / 1000
+        return self.current_time
+
+
+class ChildClock(BaseClock):
+    def __init__(self, parent: BaseClock, scale: float = 1):
+        """A clock that follows 'parent' at 'scale' times its speed. Pausing, scaling or stepping it affects every clock
+        and timer below it in the tree at once, without visiting them."""
+        self.parent = parent
+        self.scale = scale
+        self.paused = False
+        # The time of this clock and of its parent when they were last synchronized.
+        self.start_time = 0
+        self.parent_start_time = parent.now()
+
+    def now(self) -> float:
+        if self.paused:
+            return self.start_time
+        return self.start_time + (self.parent.now() - self.parent_start_time) * self.scale
+
+    def sync(self) -> None:
+        self.start_time = self.now()
+        self.parent_start_time = self.parent.now()
+
+    def pause(self) -> None:
+        if not self.paused:
+            self.sync()
+            self.paused = True
+
+    def unpause(self) -> None:
+        if self.paused:
+            self.parent_start_time = self.parent.now()
+            self.paused = False
+
+    def is_paused(self) -> bool:
+        return self.paused
+
+    def set_scale(self, scale: float) -> None:
+        self.sync()
+        self.scale = scale
+
+    def get_scale(self) -> float:
+        return self.scale
+
+    def step(self, delta_time: float) -> None:
+        """Moves this clock forward by 'delta_time' seconds, which also works while it is paused."""
+        self.start_time += delta_time
+
+
+class ManualClock(BaseClock):
+    def __init__(self, start_time: float = 0):
+        """A clock that only moves forward when 'advance' is called, which allows game objects to be simulated faster
+        (or slower) than real time."""
+        self.current_time = start_time
+
+    def advance(self, delta_time: float) -> None:
+        self.current_time += delta_time
+
+    def now(self) -> float:
+        return self.current_time
+
+
+frame_clock = FrameClock()  # Used by timers that aren't given a clock, and ticked by the main loop.
+ui_clock = ChildClock(frame_clock)  # Used by the timers of widgets, so pausing or scaling it affects the whole UI.
+
+
+class Time:
+    state_format = "dd?"
+
+    def __init__(self, clock: Optional[BaseClock] = None):
+        self.clock = frame_clock if clock is None else clock
         self.timer = 0
         self.previous_result = 0
         self.paused = False
 
     def reset_timer(self) -> None:
-        self.timer = pygame.time.get_ticks() / 1000
+        self.timer = self.clock.now()
         self.previous_result = 0
 
     def get_time(self) -> float:
         if not self.paused:
-            self.previous_result = pygame.time.get_ticks() / 1000 - self.timer
+            self.previous_result = self.clock.now() - self.timer
         return self.previous_result
 
     def force_elapsed_time(self, value: float) -> None:
-        self.timer = pygame.time.get_ticks() / 1000 - value
+        self.timer = self.clock.now() - value
 
     def pause(self) -> None:
         self.paused = True
@@ -32,3 +120,11 @@ class Time:
 
     def get_prev_time(self) -> float:
         return self.previous_result
+
+    def get_state(self) -> Tuple[float, float, bool]:
+        return self.timer, self.previous_result, self.paused
+
+    def set_state(self, timer: float, previous_result: float, paused: bool) -> None:
+        self.timer = timer
+        self.previous_result = previous_result
+        self.paused = paused
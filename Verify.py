@@ -0,0 +1,113 @@
+"""
+Verifies the scores on scoreboards by re-simulating their replays headless, spread over a pool of processes.
+
+A score is verified if its replay plays back to exactly the claimed score, with the resolution and tick rate of the game.
+Scores that were submitted before replays were recorded, or whose replays are from an older version of the game, can't be
+verified, and are reported separately.
+
+Usage: python Verify.py <directory> [--workers <count>]
+
+Every 'scoreboard.csv' file in the directory (and its sub-directories) is checked.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from Global import *
+import argparse
+import binascii
+import Storage
+import Replay
+import base64
+import time
+import csv
+import sys
+import os
+results = ("verified", "mismatch", "no replay", "outdated", "invalid replay")
+name_field, score_field, replay_field = Storage.ScoreDB.fields
+
+
+def verify_replay(data: bytes,
+                  claimed_score: int) -> Tuple[Literal["verified", "mismatch", "outdated", "invalid replay"], int]:
+    """Plays the replay back and returns whether it reaches the claimed score, along with the score it reached (-1 if
+    the replay can't be played back)."""
+    version = Replay.Replay.read_version(data)
+    if version is not None and version < Replay.Replay.version:
+        return "outdated", -1
+    try:
+        replay = Replay.Replay.decode(data)
+    except ValueError:
+        return "invalid replay", -1
+    if replay.resolution != GAME_RESOLUTION or replay.tick_rate != TICK_RATE:
+        return "invalid replay", -1  # The round wasn't played with the settings of the game.
+    score = Replay.play_headless(replay).get_score()
+    return ("verified" if score == claimed_score == replay.score else "mismatch"), score
+
+
+def verify_entry(entry: Tuple[str, str]) -> Tuple[str, int]:
+    """Verifies a score and the Base64 text of its replay, as stored on the scoreboard."""
+    score, replay_text = entry
+    if not replay_text:
+        return "no replay", -1
+    try:
+        data = base64.b64decode(replay_text, validate=True)
+    except binascii.Error:
+        return "invalid replay", -1
+    try:
+        claimed_score = int(score)
+    except ValueError:
+        return "mismatch", -1
+    try:
+        return verify_replay(data, claimed_score)
+    except Exception:  # A replay that breaks the simulation is reported like any other, instead of ending the run.
+        return "invalid replay", -1
+
+
+def find_scoreboards(directory: str) -> List[str]:
+    return sorted(os.path.join(root, "scoreboard.csv") for root, _, files in os.walk(directory)
+                  if "scoreboard.csv" in files)
+
+
+def read_scoreboard(file_path: str) -> List[Dict[str, str]]:
+    """Returns the entries of a scoreboard, keyed by the columns of 'Storage.ScoreDB', without the header. Raises
+    OSError if the file can't be read, or ValueError if its header doesn't match those columns."""
+    with open(file_path, "r", encoding="utf-8", newline="") as file:
+        entries = list(csv.DictReader(file, Storage.ScoreDB.fields, restval=""))
+    # Scoreboards from older versions don't have the replay column, which is left empty in their header.
+    if not entries or any(entries[0][field] not in (field, "") or (field != replay_field and not entries[0][field])
+                          for field in Storage.ScoreDB.fields):
+        raise ValueError("the header doesn't match the columns of a scoreboard")
+    return entries[1:]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Verifies the scores on Flappy Bird scoreboards by re-simulating "
+                                                 "their replays.")
+    parser.add_argument("directory", help="the directory to search for 'scoreboard.csv' files")
+    parser.add_argument("--workers", type=int, default=None, help="the number of processes to use (one per CPU core "
+                                                                  "by default)")
+    args = parser.parse_args()
+    entries: List[Tuple[str, Dict[str, str]]] = []
+    for file_path in find_scoreboards(args.directory):
+        try:
+            entries.extend((file_path, entry) for entry in read_scoreboard(file_path))
+        except (OSError, ValueError) as error:
+            print("Failed to read '{}': {}".format(file_path, error), file=sys.stderr)
+    start = time.perf_counter()
+    counts = dict.fromkeys(results, 0)
+    with ProcessPoolExecutor(args.workers) as executor:
+        # Submitting the entries in chunks keeps the overhead of sending them to the workers low.
+        chunk_size = max(1, len(entries) // (4 * (args.workers or os.cpu_count() or 1)))
+        for (file_path, entry), (result, score) in zip(entries, executor.map(
+                verify_entry, [(entry[score_field], entry[replay_field]) for _, entry in entries], chunksize=chunk_size)):
+            counts[result] += 1
+            if result == "mismatch":
+                print("{}: '{}' claimed {}, but the replay scored {}".format(file_path, entry[name_field],
+                                                                            entry[score_field], score))
+            elif result == "invalid replay":
+                print("{}: '{}' has an invalid replay".format(file_path, entry[name_field]))
+    print("Checked {} scores in {:.2f} seconds: {}".format(len(entries), time.perf_counter() - start,
+                                                          ", ".join("{} {}".format(counts[result], result)
+                                                                    for result in results)))
+    sys.exit(1 if counts["mismatch"] or counts["invalid replay"] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -46,6 +46,10 @@ os.environ["SDL_IME_SHOW_UI"] = "1"  # Enable showing the IME candidate list.
 
 
 class BaseWidget(pygame.sprite.Sprite):
+    # True if the widget never draws into its image after creating it, so a change to the image can be detected by its
+    # identity. Frames use this to report which parts of them changed.
+    static_image = False
+
     def __init__(self, widget_name: str = "!base_widget"):
         """Base class for all widgets."""
         super().__init__()
@@ -66,6 +70,8 @@ class BaseWidget(pygame.sprite.Sprite):
 
 
 class AnimatedSurface(BaseWidget):
+    static_image = True
+
     def __init__(self,
                  x: Union[int, float],
                  y: Union[int, float],
@@ -95,13 +101,13 @@ class AnimatedSurface(BaseWidget):
         self.max_brightness = 100
         self.brighten_step = 330
         self.flash_state = "idle"  # Literal["idle", "brighten", "darken"]
-        self.flash_timer = Time.Time()
+        self.flash_timer = Time.Time(Time.ui_clock)
         # endregion
         # region Resize Animation Data
         self.difference = self.max_width - self.min_width
         self.reducing_fraction = 0.2
         self.resize_state = "small"  # Literal["small", "large", "dilating", "shrinking"]
-        self.delta_timer = Time.Time()
+        self.delta_timer = Time.Time(Time.ui_clock)
         self.delta_timer.reset_timer()
         # endregion
         self.lock = True
@@ -234,6 +240,8 @@ class Button(AnimatedSurface):
 
 
 class Label(BaseWidget):
+    static_image = True
+
     def __init__(self,
                  x: Union[int, float],
                  y: Union[int, float],
@@ -275,6 +283,8 @@ class Label(BaseWidget):
 
 
 class SplitLabel(BaseWidget):
+    static_image = True
+
     def __init__(self, x: Union[int, float], y: Union[int, float], lines: Tuple[str, str], wrap_widths: Tuple[int, int],
                  font: pygame.font.Font, fg: Tuple[int, int, int], bg: Tuple[int, int, int], radius: int, padding: int,
                  widget_name: str = "!split_label"):
@@ -299,6 +309,8 @@ class SplitLabel(BaseWidget):
 
 
 class ParagraphRect(BaseWidget):
+    static_image = True
+
     def __init__(self, x: Union[int, float], y: Union[int, float], width: int, radius: int, padding: int,
                  fg: Tuple[int, int, int], bg: Tuple[int, int, int], heading: str, body: str,
                  heading_font: pygame.font.Font, body_font: pygame.font.Font, widget_name: str = "!p_rect"):
@@ -621,24 +633,24 @@ class Entry(BaseWidget):
         self.caret_restore_pos = -1
         # (start sticky keys, start timer, has reset repeat, repeat timer)
         self.sticky_keys = {pygame.K_LEFT: [False,
-                                            Time.Time(),
+                                            Time.Time(Time.ui_clock),
                                             False,
-                                            Time.Time(),
+                                            Time.Time(Time.ui_clock),
                                             lambda: self.text_canvas.change_caret_pos("l")],
                             pygame.K_RIGHT: [False,
-                                             Time.Time(),
+                                             Time.Time(Time.ui_clock),
                                              False,
-                                             Time.Time(),
+                                             Time.Time(Time.ui_clock),
                                              lambda: self.text_canvas.change_caret_pos("r")],
                             pygame.K_BACKSPACE: [False,
-                                                 Time.Time(),
+                                                 Time.Time(Time.ui_clock),
                                                  False,
-                                                 Time.Time(),
+                                                 Time.Time(Time.ui_clock),
                                                  self.text_canvas.backspace],
                             pygame.K_DELETE: [False,
-                                              Time.Time(),
+                                              Time.Time(Time.ui_clock),
                                               False,
-                                              Time.Time(),
+                                              Time.Time(Time.ui_clock),
                                               self.text_canvas.delete]}
         self.start_delay = 0.5
         self.repeat_delay = 0.1
@@ -908,11 +920,11 @@ class EntryText:
         self.caret_height = height - 4
         self.caret_surf = pygame.Surface((self.caret_width, self.caret_height))
         self.caret_surf.fill(BLACK)
-        self.caret_timer = Time.Time()
+        self.caret_timer = Time.Time(Time.ui_clock)
         self.caret_delay = 0.5
         self.scroll_amount = 70
         self.scroll_time = 0
-        self.scroll_timer = Time.Time()
+        self.scroll_timer = Time.Time(Time.ui_clock)
         self.scroll_timer.reset_timer()
         self.display_caret = True
         self.focus = False
@@ -1821,7 +1833,7 @@ class ScrollButton(pygame.sprite.Sprite):
         self.mouse_down = False
         self.start_delay = 0.2
         self.repeat_delay = 0.1
-        self.button_timer = Time.Time()
+        self.button_timer = Time.Time(Time.ui_clock)
         self.repeating = False
         # Color format: (bg, fg)
         self.dormant_color = (GREY1, GREY6)
@@ -1893,7 +1905,7 @@ class Spinner(BaseWidget):
         self.thickness = thickness
         self.speed = speed
         self.angle = 0
-        self.delta_timer = Time.Time()
+        self.delta_timer = Time.Time(Time.ui_clock)
         self.unlit_color = unlit_color
         self.lit_color = lit_color
         self.image = pygame.Surface((self.length, self.length))
@@ -1959,6 +1971,11 @@ class Frame(BaseWidget):
         # Stores the order with which widgets will be rendered. The last item will be rendered last, and therefore
         # will be on the topmost layer.
         self.render_z_order = []
+        # The image, position and 'static_image' flag of every widget in the last render, and when the changed areas
+        # were last calculated.
+        self.drawn_widgets: Dict[str, Tuple[pygame.Surface, Union[int, float], Union[int, float], bool]] = {}
+        self.reported_widgets: Dict[str, Tuple[pygame.Surface, Union[int, float], Union[int, float], bool]] = {}
+        self.reported_rect: Optional[pygame.Rect] = None
 
     def add_widget(self, widget_obj: Union[BaseWidget, RadioGroup]) -> None:
         if isinstance(widget_obj, RadioGroup):
@@ -2084,11 +2101,35 @@ class Frame(BaseWidget):
 
     def render_widgets(self) -> None:
         self.image.fill(self.bg)
+        drawn_widgets = {}
         for w_name in self.render_z_order:
             widget_y = (self.child_widgets[w_name].y
                         + (0 if isinstance(self.child_widgets[w_name], ScrollBar) else self.y_scroll_offset))
             if widget_y + self.child_widgets[w_name].image.get_height() >= 0 and widget_y < self.height:
                 self.image.blit(self.child_widgets[w_name].image, (self.child_widgets[w_name].rect.x, widget_y))
+                drawn_widgets[w_name] = (self.child_widgets[w_name].image, self.child_widgets[w_name].rect.x, widget_y,
+                                         self.child_widgets[w_name].static_image)
+        self.drawn_widgets = drawn_widgets
+
+    def calc_changed_rects(self) -> List[pygame.Rect]:
+        """Returns the areas of the screen that the frame's image may have changed in since the last call. Widgets are
+        compared by the identity and position of their images, and widgets without a static image are always
+        included."""
+        if self.rect != self.reported_rect:
+            rects = [self.rect.copy()] if self.reported_rect is None else [self.rect.copy(), self.reported_rect]
+        else:
+            rects = []
+            for w_name in self.drawn_widgets.keys() | self.reported_widgets.keys():
+                current = self.drawn_widgets.get(w_name)
+                previous = self.reported_widgets.get(w_name)
+                if current is not None and (current != previous or not current[3]):
+                    rects.append(pygame.Rect(self.x + current[1], self.y + current[2], *current[0].get_size()))
+                if previous is not None and previous != current:
+                    rects.append(pygame.Rect(self.x + previous[1], self.y + previous[2], *previous[0].get_size()))
+            rects = [rect.clip(self.rect) for rect in rects]
+        self.reported_widgets = self.drawn_widgets
+        self.reported_rect = self.rect.copy()
+        return rects
 
     def raise_widget_layer(self, widget_name: str) -> None:
         """
@@ -2153,7 +2194,7 @@ class Window(pygame.sprite.Sprite):
                                      self.distance)
         self.border_radius = border_radius
         self.speed_factor = speed_factor
-        self.timer = Time.Time()
+        self.timer = Time.Time(Time.ui_clock)
         self.timer.reset_timer()
         self.image = pygame.Surface((self.width, self.height), flags=pygame.SRCALPHA)
         self.rect = pygame.Rect(self.x, self.y, self.width, self.height)
@@ -2273,7 +2314,7 @@ class SceneTransition(BaseOverlay):
         self.alpha = 0
         self.speed = speed
         self.max_alpha = 255
-        self.timer = Time.Time()
+        self.timer = Time.Time(Time.ui_clock)
         self.timer.reset_timer()
 
     def update(self) -> int:
@@ -4,26 +4,39 @@ from Global import *
 import Mouse
 import Widgets
 import Dialogs
+import Autopilot
 import Ground
-import Bird
-import Pipe
+import Session
 import Rainbow
 import Keyboard
 import Notifier
 import Storage
 import Counters
+import Compositor
+import Presenter
+import Scenery
+import Pipe
+import Bird
 import pygame
+import Time
+import struct
+import argparse
 
 
 class MainThread:
-    def __init__(self):
+    def __init__(self, presentation: Literal["surface", "renderer", "native"] = "surface",
+                 scale_mode: Optional[Literal["nearest", "smooth", "integer"]] = None):
         pygame.init()
         # region Display Data
-        self.fixed_resolution = (641, 858)
+        self.fixed_resolution = GAME_RESOLUTION
         self.current_resolution = list(self.fixed_resolution)
         self.restore_resolution = None
         self.monitor_info = pygame.display.Info()
         self.monitor_resolution = (self.monitor_info.current_w, self.monitor_info.current_h)
+        # The surface presenter scales the screen with Pygame, and the renderer lets SDL scale it, while the native
+        # presenter draws the game world at the resolution of the window. See 'Presenter' and 'Native'.
+        self.presentation = presentation
+        self.scale_mode = scale_mode  # The default of the presenter is used if None.
         # endregion
         # region State Variables
         self.game_state: Literal["menu", "waiting", "started", "dying", "help", "achievements", "results"] = "menu"
@@ -32,13 +45,21 @@ class MainThread:
         self.rainbow_mode = False
         self.full_screen = False
         # endregion
+        # region Clock Tree
+        # The real time is sampled once per frame by the root clock, and every timer reads it through one of these
+        # groups. The menu ground and the frame timer of rounds are paused with the game, while the UI and effects keep
+        # running. Timers that aren't given a clock read the root clock directly, while widgets read the UI clock.
+        self.world_clock = Time.ChildClock(Time.frame_clock)
+        self.ui_clock = Time.ui_clock
+        self.effects_clock = Time.ChildClock(Time.frame_clock)
+        # endregion
         # region Assets Storage
         self.audio_objects: Dict[str, pygame.mixer.Sound] = {
             "rickroll": pygame.mixer.Sound(find_abs_path("./Sounds/Rickroll.wav"))
         }
         self.volume = 100
-        self.resized_surface = pygame.Surface(self.fixed_resolution)
         self.display_surface = pygame.Surface(self.fixed_resolution)
+        self.compositor = Compositor.Compositor(self.fixed_resolution)
         # endregion
         # region Widget Setup
         self.font = pygame.font.SysFont("arial", 35)
@@ -51,23 +72,27 @@ class MainThread:
         # endregion
         # region Key Sequences
         self.key_table: Dict[str, int] = {"↑": pygame.K_UP, "↓": pygame.K_DOWN, "←": pygame.K_LEFT, "→": pygame.K_RIGHT}
-        for char in "abciklorxyz":
+        for char in "abciklortxyz":
             # Generate all needed key codes.
             exec("self.key_table['{c}'] = pygame.K_{c}".format(c=char))
         konami_string = "↑↑↓↓←→←→ba"
         magic_string = "xyzzy"
         rickroll_string = "rickroll"
-        self.konami = Keyboard.KeySequence(self.key_generator(konami_string))
-        self.magic_word = Keyboard.KeySequence(self.key_generator(magic_string))
-        self.rickroll = Keyboard.KeySequence(self.key_generator(rickroll_string))
+        robot_string = "robot"
+        self.konami = Keyboard.KeySequence(self.key_generator(konami_string), self.ui_clock)
+        self.magic_word = Keyboard.KeySequence(self.key_generator(magic_string), self.ui_clock)
+        self.rickroll = Keyboard.KeySequence(self.key_generator(rickroll_string), self.ui_clock)
+        self.robot = Keyboard.KeySequence(self.key_generator(robot_string), self.ui_clock)
         # endregion
         # region Window Creation
         pygame.display.set_caption("Flappy Bird")
         pygame.display.set_icon(pygame.image.load(find_abs_path("./Images/Icons/window_icon.png")))
-        self.display = pygame.display.set_mode(self.fixed_resolution, pygame.RESIZABLE)
+        self.presenter = self.create_presenter()
+        self.display = self.presenter.set_mode(self.fixed_resolution)
+        self.display_surface = self.presenter.surface  # Converted to the pixel format of the window.
         self.listen_events = (pygame.QUIT, pygame.WINDOWFOCUSLOST, pygame.WINDOWENTER, pygame.WINDOWLEAVE,
-                              pygame.VIDEORESIZE, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP, pygame.MOUSEWHEEL,
-                              pygame.KEYDOWN, pygame.KEYUP, pygame.TEXTINPUT, pygame.TEXTEDITING)
+                              pygame.WINDOWEXPOSED, pygame.VIDEORESIZE, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP,
+                              pygame.MOUSEWHEEL, pygame.KEYDOWN, pygame.KEYUP, pygame.TEXTINPUT, pygame.TEXTEDITING)
         pygame.event.set_blocked(None)
         pygame.event.set_allowed(self.listen_events)
         pygame.key.stop_text_input()
@@ -77,16 +102,17 @@ class MainThread:
         for image in ("pause_icon", "settings_icon", "toggle_fullscreen_icon", "trophy"):
             self.icons[image] = pygame.image.load(find_abs_path("./Images/Icons/{}.png".format(image))).convert_alpha()
         self.init_menu_frame()
-        self.background = pygame.image.load(find_abs_path("./Images/Sprites/background.png")).convert_alpha()
+        self.scenery = Scenery.Scenery(self.fixed_resolution, self.display_surface)
         self.mouse_obj = Mouse.Cursor()
         # Object z-orders = 1: toast-group, 2: transition, 3: top-level windows, 4: widget-frame, 5: bird (final)
-        self.bird = Bird.BirdManager(self.fixed_resolution, z_index=5)
-        self.tiles_group = Ground.GroundGroup(self.fixed_resolution)
+        self.tiles_group = Ground.GroundGroup(self.fixed_resolution, self.world_clock)
         self.font_height = 50
         self.kerning = 5
-        self.pipe_group = Pipe.PipeGroup(self.fixed_resolution, self.tiles_group.get_size(), self.font_height,
-                                         self.kerning)
-        self.notifiers = Notifier.ToastGroup(self.fixed_resolution, self.icons["trophy"], z_index=1)
+        self.session: Optional[Session.GameSession] = None  # Holds the bird, pipes and ground of the current round.
+        self.prescale_sprites()
+        self.course_block = 64  # The number of pipe gaps generated at a time before they are needed.
+        self.notifiers = Notifier.ToastGroup(self.fixed_resolution, self.icons["trophy"], z_index=1,
+                                            clock=self.ui_clock)
         self.achievement_list = Storage.AchievementData()
         self.achievement_db = Storage.AchievementDB(self.achievement_list.get_achievement_len())
         data = self.achievement_db.read_data()
@@ -97,17 +123,33 @@ class MainThread:
                             .format(self.achievement_db.parent_dir)
             raise RuntimeError(error_message)
         self.achievement_list.load_achievements(data, self.achievement_db.set_achievement)
-        self.rainbow = Rainbow.Rainbow()
+        # A round that was paused when the game closed is resumed the next time a round is started.
+        self.round_snapshot = Storage.RoundSnapshot(partial(self.achievement_db.set_achievement, -1))
+        self.resume_data = self.round_snapshot.load()
+        self.replay_store = Storage.ReplayStore(partial(self.achievement_db.set_achievement, -1))
+        self.rainbow = Rainbow.Rainbow(self.effects_clock)
         self.fps_counter = Counters.FPS(self.fixed_resolution)
+        # Plays rounds on its own while enabled. The debug overlay shows how fast it searches.
+        self.autopilot: Optional[Autopilot.Autopilot] = None
+        self.node_counter = Counters.NodeRate(self.fixed_resolution, self.fps_counter.rect.bottom)
         # endregion
         # region Timing Control
         self.fps = 90
         self.clock = pygame.time.Clock()
+        # When enabled, rounds are simulated in ticks of a constant length regardless of the frame rate, so the same
+        # inputs always produce the same round.
+        self.fixed_timestep = True
+        self.tick_rate = TICK_RATE
+        self.max_frame_time = 0.25  # Clamps the time simulated per frame so slow frames can't snowball.
+        self.accumulator = 0
+        self.frame_timer = Time.Time(self.world_clock)
         # endregion
         while self.game_run:
             self.clock.tick(self.fps)
+            Time.frame_clock.tick()
             self.key_events.clear()
             self.mouse_obj.reset_scroll()
+            resize_size: Optional[Tuple[int, int]] = None
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     self.achievement_db.set_achievement(-1)
@@ -116,9 +158,12 @@ class MainThread:
                     self.mouse_obj.mouse_enter()
                 elif event.type == pygame.WINDOWLEAVE:
                     self.mouse_obj.mouse_leave()
+                elif event.type == pygame.WINDOWEXPOSED:
+                    self.presenter.invalidate()
+                    self.compositor.invalidate()  # The native presenter draws the world into the window itself.
                 elif event.type == pygame.VIDEORESIZE:
                     if not self.full_screen:
-                        self.resize_window(event)
+                        resize_size = event.size  # Dragging the window sends bursts of these, so only the last counts.
                 elif event.type == pygame.MOUSEBUTTONDOWN:
                     self.mouse_obj.set_button_state(event.button, True)
                 elif event.type == pygame.MOUSEBUTTONUP:
@@ -133,6 +178,7 @@ class MainThread:
                         self.check_key_sequence(self.konami, event.key, self.toggle_rainbow)
                         self.check_key_sequence(self.magic_word, event.key, self.toggle_debug)
                         self.check_key_sequence(self.rickroll, event.key, self.toggle_rickroll)
+                        self.check_key_sequence(self.robot, event.key, self.toggle_autopilot)
                         # endregion
                         if event.key == pygame.K_ESCAPE and self.full_screen:
                             self.toggle_full_screen()
@@ -140,14 +186,15 @@ class MainThread:
                                 "transition" not in self.special_widgets and \
                                 "pause" not in self.special_widgets:
                             if event.key == pygame.K_SPACE:
-                                self.bird.process_user_events(self.access_game_state, self.pipe_group, self.mouse_obj,
-                                                              False)
+                                self.session.process_user_events(self.mouse_obj, False)
                             elif event.key == pygame.K_p:
                                 self.schedule_pause_game()
+            if resize_size is not None:
+                self.resize_window(resize_size)
             self.mouse_obj.set_pos(*resize_mouse_pos(pygame.mouse.get_pos(),
                                                      self.fixed_resolution,
                                                      self.current_resolution,
-                                                     self.resized_surface.get_size()))
+                                                     self.presenter.get_size()))
             # region User Events and Updating Game Objects
             self.mouse_obj.reset_z_index()  # Set mouse event processing z-order back to top.
             if "transition" in self.special_widgets and isinstance(self.special_widgets["transition"][0], tuple):
@@ -186,7 +233,7 @@ class MainThread:
             key: Optional[Literal["settings", "pause", "send_score"]] = None
             if "settings" in self.special_widgets:
                 key = "settings"
-            elif "pause" in self.special_widgets:
+            elif "pause" in self.special_widgets and isinstance(self.special_widgets["pause"][0], Dialogs.Pause):
                 key = "pause"
             elif "send_score" in self.special_widgets and isinstance(self.special_widgets["send_score"][0],
                                                                      Dialogs.SubmitScore):
@@ -216,59 +263,136 @@ class MainThread:
                     self.tiles_group.move()
                     self.tiles_group.reset_pos()
                 elif self.game_state in ("waiting", "started", "dying"):
-                    self.bird.process_user_events(self.access_game_state, self.pipe_group, self.mouse_obj, True)
-                    self.bird.update(self.tiles_group, self.pipe_group, self.access_game_state, self.init_dying_frame,
-                                     self.schedule_game_over)
+                    self.session.process_user_events(self.mouse_obj, True)
+                    self.step_session()
             if self.rainbow_mode:
                 self.rainbow.tick()
             self.fps_counter.tick()
             self.notifiers.update()  # Does nothing if there are no toast notifications.
             # endregion
             # region Screen Rendering
-            self.display_surface.fill(BLACK)
-            self.display_surface.blit(self.background, (0, 0))
-            self.tiles_group.draw(self.display_surface)
-            if self.game_state in ("started", "dying"):
-                self.pipe_group.draw(self.display_surface)
-                if self.debug:
-                    self.pipe_group.draw_hit_box(self.display_surface)
-            if self.game_state in ("waiting", "started", "dying"):
-                self.bird.advanced_draw(self.display_surface, self.debug)  # For debug mode support.
-                score_obj = self.pipe_group.get_score_obj()
-                size = score_obj.calc_size()
-                score_obj.draw(self.display_surface, (self.fixed_resolution[0] / 2 - size[0] / 2, 20))
-            if self.game_state == "results":
-                # Render score on results screen.
-                self.pipe_group.get_score_obj().draw(self.display_surface, self.ui_mgr.get_score_position())
-            if self.debug:
-                self.fps_counter.draw(self.display_surface)
-            if self.display_frame is not None:
-                self.display_surface.blit(self.display_frame.image, self.display_frame.rect)
-            if "settings" in self.special_widgets and isinstance(self.special_widgets["settings"][0],
-                                                                 Dialogs.Settings):
-                self.special_widgets["settings"][0].draw()
-            elif "pause" in self.special_widgets and isinstance(self.special_widgets["pause"][0], Dialogs.Pause):
-                self.special_widgets["pause"][0].draw()
-            elif "send_score" in self.special_widgets and isinstance(self.special_widgets["send_score"][0],
-                                                                     Dialogs.SubmitScore):
-                self.special_widgets["send_score"][0].draw()
             if show_load:
                 self.busy_frame.update(self.mouse_obj, self.key_events)
-                self.busy_frame.draw(self.display_surface)
-            if "transition" in self.special_widgets and isinstance(self.special_widgets["transition"][0],
-                                                                   Widgets.SceneTransition):
-                self.display_surface.blit(self.special_widgets["transition"][0].image,
-                                          self.special_widgets["transition"][0].rect)
-            self.notifiers.draw(self.display_surface)  # Draws nothing if empty.
-            # endregion
-            # region Display Resizing
-            self.resized_surface = resize_surf(self.display_surface, self.current_resolution)
-            self.display.fill(self.rainbow.get_color() if self.rainbow_mode else BLACK)
-            self.blit_resized_surface(self.display, self.resized_surface)
+            # Only the regions of the screen that changed since the last frame are drawn.
+            self.track_layers(show_load)
+            regions = self.compositor.end_frame()
+            for region in regions:
+                self.display_surface.set_clip(region)
+                self.draw_layers(show_load)
+            self.display_surface.set_clip(None)
             # endregion
-            pygame.display.update()
+            self.presenter.present(regions, self.rainbow.get_color() if self.rainbow_mode else BLACK)
         pygame.quit()
 
+    def create_presenter(self) -> Presenter.Presenter:
+        if self.presentation == "native":
+            try:
+                import Native
+            except ImportError:  # NumPy isn't installed.
+                self.presentation = "surface"
+            else:
+                return Native.NativePresenter(self.display_surface, self.scale_mode or "smooth")
+        if self.presentation == "renderer" and Presenter.RendererPresenter.is_available():
+            return Presenter.RendererPresenter(self.display_surface, self.scale_mode or "nearest")
+        return Presenter.Presenter(self.display_surface, self.scale_mode or "nearest")  # See 'Presenter' for the modes.
+
+    def prescale_sprites(self) -> None:
+        """Lets the presenter prepare the images of the game world for the window, so it doesn't have to while the game
+        is running."""
+        images = list(self.scenery.get_images())
+        images.extend(Pipe.Pipe.get_images())
+        images.extend(Bird.Bird.get_images())
+        images.extend(Counters.Score.get_digits(self.font_height))
+        self.presenter.prescale(images)
+
+    def get_world_blits(self) -> List[tuple]:
+        """Returns the blits that draw the game world in this frame, in the format of 'Surface.blits'."""
+        in_round = self.game_state in ("waiting", "started", "dying")
+        tiles_group = self.session.tiles_group if in_round else self.tiles_group
+        blit_sequence = self.scenery.get_blits(tiles_group.get_pos()[0])
+        if self.game_state in ("started", "dying"):
+            blit_sequence.extend(self.session.pipe_group.get_blit_sequence())
+        if in_round:
+            bird = self.session.get_bird()
+            blit_sequence.append((bird.image, bird.rect))
+            score_obj = self.session.pipe_group.get_score_obj()
+            size = score_obj.calc_size()
+            blit_sequence.extend(score_obj.get_blits((self.fixed_resolution[0] / 2 - size[0] / 2, 20)))
+        elif self.game_state == "results":
+            # Render score on results screen.
+            blit_sequence.extend(self.session.pipe_group.get_score_obj().get_blits(self.ui_mgr.get_score_position()))
+        return blit_sequence
+
+    def draw_layers(self, show_load: bool) -> None:
+        self.presenter.draw_world(self.get_world_blits())
+        if self.debug and self.game_state in ("started", "dying"):
+            self.session.pipe_group.draw_hit_box(self.display_surface)
+        if self.debug and self.game_state in ("waiting", "started", "dying"):
+            self.session.bird.draw_debug(self.display_surface, self.session.pipe_group)
+        if self.debug:
+            self.fps_counter.draw(self.display_surface)
+            if self.autopilot is not None:
+                self.node_counter.draw(self.display_surface)
+        if self.display_frame is not None:
+            self.display_surface.blit(self.display_frame.image, self.display_frame.rect)
+        dialog = self.get_active_dialog()
+        if dialog is not None:
+            dialog.draw()
+        if show_load:
+            self.busy_frame.draw(self.display_surface)
+        if "transition" in self.special_widgets and isinstance(self.special_widgets["transition"][0],
+                                                               Widgets.SceneTransition):
+            self.display_surface.blit(self.special_widgets["transition"][0].image,
+                                      self.special_widgets["transition"][0].rect)
+        self.notifiers.draw(self.display_surface)  # Draws nothing if empty.
+
+    def track_layers(self, show_load: bool) -> None:
+        """Reports the areas that each layer drawn by 'draw_layers' covers in this frame to the compositor."""
+        compositor = self.compositor
+        screen = [compositor.screen_rect]
+        if self.debug:
+            compositor.invalidate()  # The debug overlays aren't tracked.
+        compositor.track("scene", screen, (self.game_state, self.display_frame))
+        in_round = self.game_state in ("waiting", "started", "dying")
+        tiles_group = self.session.tiles_group if in_round else self.tiles_group
+        compositor.track("ground", [self.scenery.get_ground_rect().copy()],
+                         self.scenery.get_ground_offset(tiles_group.get_pos()[0]))
+        if self.game_state in ("started", "dying"):
+            blit_sequence = self.session.pipe_group.get_blit_sequence()
+            compositor.track("pipes", compositor.get_blit_rects(blit_sequence), [blit[0] for blit in blit_sequence])
+        if in_round or self.game_state == "results":
+            score_obj = self.session.pipe_group.get_score_obj()
+            size = score_obj.calc_size()
+            position = (self.ui_mgr.get_score_position() if self.game_state == "results"
+                        else (self.fixed_resolution[0] / 2 - size[0] / 2, 20))
+            # Digits are drawn at fractional positions, so the area is widened to allow for rounding.
+            compositor.track("score", [pygame.Rect(position, size).inflate(2, 2)], score_obj.get_score())
+        if in_round:
+            bird = self.session.get_bird()
+            compositor.track("bird", [bird.rect.copy()], bird.image)
+        if self.display_frame is not None:
+            compositor.add_dirty_rects(self.display_frame.calc_changed_rects())
+        dialog = self.get_active_dialog()
+        if dialog is not None:
+            # The overlay behind the window darkens the whole screen, but the content of the window can change in place.
+            compositor.track("dialog", screen, dialog.window.overlay.image.get_alpha())
+            compositor.track("dialog window", [dialog.window.rect.copy()], changed=True)
+        if show_load:
+            compositor.track("loading", screen)
+            compositor.track("spinner", [self.busy_frame.widgets["spinner"].rect.copy()], changed=True)
+        if "transition" in self.special_widgets and isinstance(self.special_widgets["transition"][0],
+                                                               Widgets.SceneTransition):
+            compositor.track("transition", screen, self.special_widgets["transition"][0].image.get_alpha())
+        compositor.track("toasts", [toast.rect.copy() for toast in self.notifiers], changed=True)
+
+    def get_active_dialog(self) -> Optional[Dialogs.BaseDialog]:
+        """Returns the dialog that is shown on top of the screen, if any."""
+        for key, dialog_class in (("settings", Dialogs.Settings), ("pause", Dialogs.Pause),
+                                  ("send_score", Dialogs.SubmitScore)):
+            if key in self.special_widgets and isinstance(self.special_widgets[key][0], dialog_class):
+                return self.special_widgets[key][0]
+        return None
+
     def access_game_state(self, new_state: Optional[str] = None) -> Optional[str]:
         if new_state is None:
             return self.game_state
@@ -316,7 +440,24 @@ class MainThread:
             widget_callbacks = [self.schedule_pause_game]
             Dialogs.h_pack_buttons_se(self.fixed_resolution, self.display_frame, widget_surfaces, widget_callbacks,
                                       padding, widen_amount)
-            self.bird.spawn_bird(self.access_game_state, self.tiles_group)
+            # Creating the session spawns the bird, which changes the game state to "waiting".
+            self.session = Session.GameSession(self.fixed_resolution, None, self.font_height, self.kerning, 5,
+                                               self.access_game_state, self.init_dying_frame, self.schedule_game_over,
+                                               self.course_block)
+            self.session.tiles_group.set_x(self.tiles_group.get_pos()[0])
+            self.prescale_sprites()  # Scales anything that isn't cached for the window size yet, before the round starts.
+            self.accumulator = 0
+            self.frame_timer.reset_timer()
+            if self.resume_data is not None:
+                try:
+                    self.session.load_round(self.resume_data)
+                except (struct.error, IndexError, ValueError):
+                    self.round_snapshot.delete()  # The file is corrupt or from an older version of the game.
+                else:
+                    self.schedule_pause_game()
+                self.resume_data = None
+            elif self.fixed_timestep:
+                self.session.start_recording(self.tick_rate)  # Rounds are only deterministic with fixed ticks.
 
     def init_dying_frame(self) -> None:
         if self.game_state == "dying":
@@ -341,10 +482,13 @@ class MainThread:
     def init_results_screen(self) -> None:
         self.display_frame = Widgets.Frame(0, 0, self.fixed_resolution[0], self.fixed_resolution[1], 20, z_index=4)
         self.busy_frame.reset_animation()
-        self.ui_mgr = Dialogs.LoseScreen(self.display_frame, self.fixed_resolution, self.pipe_group.get_score_obj(),
+        self.tiles_group.set_x(self.session.tiles_group.get_pos()[0])
+        replay = self.save_replay()
+        self.ui_mgr = Dialogs.LoseScreen(self.display_frame, self.fixed_resolution,
+                                         self.session.pipe_group.get_score_obj(),
                                          [partial(self.schedule_toggle_round, "game"),
                                           partial(self.schedule_toggle_round, "menu")],
-                                         partial(self.achievement_db.set_achievement, -1))
+                                         partial(self.achievement_db.set_achievement, -1), replay)
         self.ui_mgr.start_fetch_data()
         self.game_state = "results"
 
@@ -404,44 +548,70 @@ class MainThread:
                                                   self.init_results_screen]
 
     def reset_unusable_objects(self) -> None:
-        self.bird = Bird.BirdManager(self.fixed_resolution, z_index=5)
-        self.pipe_group = Pipe.PipeGroup(self.fixed_resolution, self.tiles_group.get_size(), self.font_height,
-                                         self.kerning)
+        if self.session is not None:
+            self.tiles_group.set_x(self.session.tiles_group.get_pos()[0])
+            self.save_replay()  # Saves rounds that were quit from the pause menu.
+        self.session = None
+
+    def save_replay(self) -> Optional[bytes]:
+        """Saves the replay of the current round if it was recorded, and returns the encoded replay."""
+        replay = self.session.stop_recording()
+        if replay is None:
+            return None
+        data = replay.encode()
+        self.replay_store.save(data, replay.seed)
+        return data
+
+    def step_session(self) -> None:
+        """Advances the current round by the time that has passed since the last call. In fixed timestep mode, the time
+        is collected in an accumulator and the round is only simulated in whole ticks, with the remainder carried over
+        to the next frame."""
+        frame_time = self.frame_timer.get_time()
+        self.frame_timer.reset_timer()
+        if self.autopilot is not None:
+            self.autopilot.start_frame()
+        if not self.fixed_timestep:
+            self.session.step(frame_time, self.autopilot is not None and self.autopilot.decide(self.session))
+        else:
+            tick_length = 1 / self.tick_rate
+            self.accumulator += min(frame_time, self.max_frame_time)
+            while self.accumulator >= tick_length:
+                self.session.step(tick_length, self.autopilot is not None and self.autopilot.decide(self.session))
+                self.accumulator -= tick_length
+        if self.autopilot is not None:
+            self.node_counter.tick(self.autopilot.pop_node_count())
 
     def pause_game(self) -> None:
-        self.bird.pause()
-        self.tiles_group.pause()
-        self.pipe_group.pause_flash()
+        # The round's clock only advances when the session is stepped, so only the world clock has to be paused.
+        self.world_clock.pause()
+        if self.session is not None:
+            self.session.record_input("pause")
+            self.round_snapshot.save(self.session.save_round())  # Includes the replay recorded so far.
 
     def unpause_game(self) -> None:
-        self.bird.unpause()
-        self.tiles_group.unpause()
-        self.pipe_group.unpause_flash()
+        self.world_clock.unpause()
+        if self.session is not None:
+            self.session.record_input("unpause")
+        self.round_snapshot.delete()
 
     def key_generator(self, string: str) -> Tuple[int]:
         return tuple(self.key_table[char] for char in string)
 
-    def blit_resized_surface(self, display: pygame.Surface, resized_surface: pygame.Surface) -> None:
-        display.blit(resized_surface, (round(self.current_resolution[0] / 2 - resized_surface.get_width() / 2),
-                                       round(self.current_resolution[1] / 2 - resized_surface.get_height() / 2)))
-
-    def resize_window(self, event: pygame.event.Event) -> None:
-        self.current_resolution[0] = event.w
-        self.current_resolution[1] = event.h
-        if self.current_resolution[0] < self.fixed_resolution[0]:
-            self.current_resolution[0] = self.fixed_resolution[0]
-        if self.current_resolution[1] < self.fixed_resolution[1]:
-            self.current_resolution[1] = self.fixed_resolution[1]
-        self.display = pygame.display.set_mode(self.current_resolution, pygame.RESIZABLE)
+    def resize_window(self, size: Tuple[int, int]) -> None:
+        self.current_resolution[0] = max(size[0], self.fixed_resolution[0])
+        self.current_resolution[1] = max(size[1], self.fixed_resolution[1])
+        # Windows that are smaller than the fixed resolution are enlarged again.
+        self.display = self.presenter.set_mode(self.current_resolution,
+                                               resized=tuple(self.current_resolution) == tuple(size))
+        self.compositor.invalidate()  # The native presenter draws the world into the window itself.
+        self.prescale_sprites()
         self.update_window_ime_size()
 
     def update_window_ime_size(self) -> None:
         if self.game_state == "results" and "send_score" in self.special_widgets and \
                 isinstance(self.special_widgets["send_score"][0], Dialogs.SubmitScore):
             self.special_widgets["send_score"][0].window_resize_event(self.current_resolution,
-                                                                      resize_surf(self.display_surface,
-                                                                                  self.current_resolution,
-                                                                                  size_only=True))
+                                                                      self.presenter.get_size())
 
     def check_key_sequence(self, sequence_obj: Keyboard.KeySequence, key_code: int,
                            callback: Callable[[], None]) -> None:
@@ -475,22 +645,39 @@ class MainThread:
                 achievement_text = self.achievement_list.get_new_achievement(2)
                 self.notifiers.create_toast(*achievement_text)
 
+    def toggle_autopilot(self) -> None:
+        if self.autopilot is None:
+            self.autopilot = Autopilot.Autopilot(self.fixed_resolution, 1 / self.tick_rate, precompute=self.course_block)
+            self.node_counter.stop()
+        else:
+            self.autopilot = None
+
     def toggle_full_screen(self) -> None:
         if self.full_screen:
             self.full_screen = False
             self.current_resolution = list(self.restore_resolution)
-            self.display = pygame.display.set_mode(self.current_resolution, pygame.RESIZABLE)
         else:
             self.full_screen = True
             self.restore_resolution = tuple(self.current_resolution)
             self.current_resolution = list(self.monitor_resolution)
-            self.display = pygame.display.set_mode(self.current_resolution, pygame.FULLSCREEN)
+        self.display = self.presenter.set_mode(self.current_resolution, self.full_screen)
+        self.compositor.invalidate()
+        self.prescale_sprites()
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Flappy Bird")
+    parser.add_argument("--presentation", choices=("surface", "renderer", "native"), default="surface",
+                        help="how the screen is drawn to the window: scaled by Pygame ('surface'), scaled by SDL "
+                             "('renderer'), or drawn at the resolution of the window ('native', which requires NumPy)")
+    parser.add_argument("--scale-mode", choices=Presenter.Presenter.scale_modes, default=None,
+                        help="how the screen is scaled to the window: to fill it with nearest neighbour ('nearest') or "
+                             "bilinear ('smooth') scaling, or by whole multiples only ('integer'). The default is "
+                             "'smooth' for the native presentation and 'nearest' otherwise")
+    args = parser.parse_args()
     if pygame.version.vernum >= (2, 0, 1):
         configure_dpi()
-        MainThread()
+        MainThread(args.presentation, args.scale_mode)
     else:
         print("This game requires Pygame version 2.0.1 or higher to run. Consider updating your version of Pygame "
               "with the command: 'python -m pip install --upgrade pygame'")
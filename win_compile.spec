@@ -5,7 +5,7 @@ block_cipher = None
 
 
 a = Analysis(
-    ['main.py', 'Bird.py', 'Counters.py', 'Dialogs.py', 'Global.py', 'Ground.py', 'Keyboard.py', 'Mouse.py', 'Notifier.py', 'Physics.py', 'Pipe.py', 'Rainbow.py', 'Storage.py', 'Time.py', 'Widgets.py'],
+    ['main.py', 'Autopilot.py', 'Batch.py', 'Bird.py', 'Compositor.py', 'Counters.py', 'Dialogs.py', 'Environment.py', 'Global.py', 'Ground.py', 'Keyboard.py', 'Mouse.py', 'Native.py', 'Notifier.py', 'Physics.py', 'Pipe.py', 'Pixels.py', 'Presenter.py', 'Rainbow.py', 'Scenery.py', 'Session.py', 'Storage.py', 'Time.py', 'Widgets.py'],
     pathex=[],
     binaries=[],
     datas=[('Help', 'Help'), ('Images', 'Images'), ('Sounds', 'Sounds')],